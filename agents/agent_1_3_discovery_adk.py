@@ -0,0 +1,256 @@
+"""
+Agents 1-3: Fused Discovery Agent
+==================================
+
+Purpose:
+--------
+Runs the work of the Customer Profiler (Agent 1), Pattern Matcher (Agent 2) and
+Action Generator (Agent 3) as ONE Gemini call with structured output.
+
+Why Fused:
+----------
+The three agents read the same customer profile and each output is only context
+for the next one, yet on the critical path they cost three sequential LLM
+round-trips and three system prompts per customer. Here the three instruction
+blocks are concatenated into one system instruction and the model returns all
+three results at once in a `DiscoveryOutput` JSON object.
+
+Role in NBA AI:
+---------------
+- Replaces Agents 1, 2 & 3 in Cluster 1 (Discovery)
+- Receives: Raw customer profile from Agent 0
+- Outputs: customer_analysis, historical_match, generated_actions
+- Feeds to: Cluster 2 (Validator + Scorer) - same session keys as before
+
+Tools:
+------
+- find_similar_customer_segment / query_historical_patterns / query_action_history
+  (called during reasoning; the schema is only enforced on the final answer)
+
+Output:
+-------
+The structured object is stored under "discovery_output", then split back
+into the three session-state keys the downstream agents already read.
+A profile seen before is served from the pipeline cache with no model call.
+
+Author: NBA AI Team
+"""
+
+import functools
+import logging
+import asyncio
+from typing import List
+from dotenv import load_dotenv
+
+from pydantic import BaseModel
+
+# ============================================================================
+# ADK IMPORTS
+# ============================================================================
+from google.adk.agents import Agent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.apps import App
+from google.adk.runners import InMemoryRunner
+from google.adk.tools import FunctionTool
+
+# ============================================================================
+# ENVIRONMENT SETUP
+# ============================================================================
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Shared ADK setup (the three fused prompts come from agents/prompts/)
+from agents.common import make_app, tier_config, PRIORITY_TIER, new_session_id, make_model, parse_json_output, to_json, shared_runner, load_prompt
+from agents.common import cache_outputs
+
+# Historical pattern tools (Agent 2)
+from tools.historical_patterns_tool import (
+    query_historical_patterns,
+    find_similar_customer_segment,
+    query_action_history,
+)
+
+# ============================================================================
+# OUTPUT SCHEMA
+# ============================================================================
+class CustomerAnalysis(BaseModel):
+    """Agent 1 section: behavioral analysis."""
+    customer_summary: str
+    purchase_intent: str
+    brand_loyalty: str
+    price_sensitivity: str
+    churn_risk_assessment: str
+    urgency_score: float
+    recommended_action_priority: str
+
+
+class HistoricalMatch(BaseModel):
+    """Agent 2 section: historical pattern match."""
+    matched_scenario: str
+    historical_success_rate: float
+    top_performing_actions: List[str]
+    recommended_channels: List[str]
+    average_roi: str
+    confidence: str
+    sample_size: int
+
+
+class GeneratedAction(BaseModel):
+    """Agent 3 section: one marketing action option."""
+    action_id: int
+    action_type: str
+    channel: str
+    offer_details: str
+    message_theme: str
+    timing_window: str
+    estimated_cost: str
+    target_segment: str
+
+
+class DiscoveryOutput(BaseModel):
+    """Combined output of the fused Discovery call."""
+    customer_analysis: CustomerAnalysis
+    historical_match: HistoricalMatch
+    generated_actions: List[GeneratedAction]
+
+
+# ============================================================================
+# AGENT INSTRUCTION
+# ============================================================================
+@functools.cache
+def discovery_instruction() -> str:
+    """Concatenate the profiler, pattern and generator prompts into one system instruction."""
+    return f"""You perform three analysis steps on the customer profile in this conversation,
+in order, and return all three results in ONE JSON object with the keys
+"customer_analysis", "historical_match" and "generated_actions".
+
+=== STEP 1: CUSTOMER ANALYSIS (customer_analysis) ===
+{load_prompt("profiler")}
+
+=== STEP 2: HISTORICAL PATTERNS (historical_match) ===
+Use find_similar_customer_segment, query_historical_patterns and
+query_action_history for historical data.
+{load_prompt("pattern")}
+
+=== STEP 3: ACTION GENERATION (generated_actions) ===
+Use your Step 1 analysis and Step 2 historical match as the previous agents' output.
+{load_prompt("generator")}"""
+
+
+# ============================================================================
+# STATE SPLITTING
+# ============================================================================
+def split_discovery_output(callback_context: CallbackContext) -> None:
+    """
+    Copy the three sections of the structured output into the session keys
+    written by the separate Agents 1-3, so Cluster 2 sees the same shape.
+    """
+    output = callback_context.state.get("discovery_output")
+    output = parse_json_output(output)
+    if not isinstance(output, dict):
+        return None
+
+    for key in ("customer_analysis", "historical_match", "generated_actions"):
+        if key in output:
+            callback_context.state[key] = to_json(output[key], indent=True)
+    return None
+
+
+# ============================================================================
+# OUTPUT CACHE
+# ============================================================================
+# The whole Discovery result depends only on the customer profile, so a
+# structurally identical profile (e.g. one drawn again from the pre-baked pool)
+# reuses the previous result instead of repeating the LLM round-trip.
+serve_cached_discovery, store_discovery = cache_outputs(
+    input_keys=("generated_customer_profile",),
+    output_keys=("discovery_output", "customer_analysis", "historical_match", "generated_actions"),
+)
+
+
+# ============================================================================
+# AGENT DEFINITION
+# ============================================================================
+@functools.cache
+def get_agent() -> Agent:
+    """Build the fused discovery agent on first use (one instance per process)."""
+    agent = Agent(
+        name="DiscoveryAgent",
+        model=make_model(tier=PRIORITY_TIER),
+        generate_content_config=tier_config(PRIORITY_TIER),  # Critical response path
+        instruction=discovery_instruction(),
+        output_schema=DiscoveryOutput,  # Sent as response_mime_type/response_schema
+        output_key="discovery_output",
+        before_agent_callback=serve_cached_discovery,
+        after_agent_callback=[split_discovery_output, store_discovery],  # Store after splitting
+        tools=[
+            FunctionTool(find_similar_customer_segment),
+            FunctionTool(query_historical_patterns),
+            FunctionTool(query_action_history)
+        ]
+    )
+    logger.debug("DiscoveryAgent created with ADK (Agents 1-3 fused)")
+    return agent
+
+
+@functools.cache
+def get_app() -> App:
+    """App with context caching - shared so the cached instruction prefix is reused."""
+    return make_app(get_agent())
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+def get_runner() -> InMemoryRunner:
+    """Return this agent's shared runner, creating it on first use."""
+    return shared_runner(get_app())
+
+
+# Module attributes built on first access, so importing this module stays cheap
+_LAZY_ATTRIBUTES = {
+    "discovery_agent": get_agent,
+    "discovery_app": get_app,
+    "discovery_runner": get_runner,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ============================================================================
+# STANDALONE TESTING
+# ============================================================================
+async def test_agent():
+    """Test the fused discovery agent with sample data."""
+    print("\n[Testing Fused Discovery Agent]\n")
+
+    runner = get_runner()
+
+    sample_profile = {
+        "customer_id": "CUST_12345",
+        "name": "Raj Kumar",
+        "segment": "premium",
+        "total_orders": 8,
+        "total_spent": 25000,
+        "days_since_last_purchase": 75,
+        "behavior": {
+            "cart_value": 3500,
+            "engagement_score": 0.3,
+            "last_action": "added_to_cart"
+        },
+        "scenario_type": "cart_abandoner",
+        "churn_risk": "high"
+    }
+
+    prompt = f"Customer profile:\n{to_json(sample_profile, indent=True, sort_keys=True)}"
+    response = await runner.run_debug(prompt, session_id=new_session_id())
+
+    print("\n[Discovery Complete]")
+    print(response)
+
+if __name__ == "__main__":
+    asyncio.run(test_agent())
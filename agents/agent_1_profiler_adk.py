@@ -38,8 +38,8 @@ Structured behavioral analysis added to session state under "customer_analysis"
 Author: NBA AI Team
 """
 
-import os
-import sys
+import functools
+import logging
 import asyncio
 from dotenv import load_dotenv
 
@@ -47,66 +47,63 @@ from dotenv import load_dotenv
 # ADK IMPORTS
 # ============================================================================
 from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
+from google.adk.apps import App
 from google.adk.runners import InMemoryRunner
-from google.genai import types
 
 # ============================================================================
 # ENVIRONMENT SETUP
 # ============================================================================
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Shared ADK setup (context caching, inference tiers)
+from agents.common import make_app, tier_config, PRIORITY_TIER, new_session_id, make_model, to_json, shared_runner, load_prompt
+
 # ============================================================================
-# RETRY CONFIGURATION
+# AGENT DEFINITION
 # ============================================================================
-retry_config = types.HttpRetryOptions(
-    attempts=5,
-    exp_base=7,
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504],
-)
+@functools.cache
+def get_agent() -> Agent:
+    """Build the customer profiler agent on first use (one instance per process)."""
+    agent = Agent(
+        name="CustomerProfilerAgent",
+        model=make_model(tier=PRIORITY_TIER),
+        generate_content_config=tier_config(PRIORITY_TIER),  # Critical response path
+        instruction=load_prompt("profiler"),
+        output_key="customer_analysis",  # Session state key
+        tools=[]  # No tools - reads from session state
+    )
+    logger.debug("CustomerProfilerAgent created with ADK")
+    return agent
+
+
+@functools.cache
+def get_app() -> App:
+    """App with context caching - shared so the cached instruction prefix is reused."""
+    return make_app(get_agent())
 
 # ============================================================================
-# AGENT DEFINITION
+# RUNNER
 # ============================================================================
-customer_profiler_agent = Agent(
-    name="CustomerProfilerAgent",
-    model=Gemini(
-        model="gemini-2.5-flash-lite",
-        retry_options=retry_config
-    ),
-    instruction="""You are an expert customer behavior analyst for an e-commerce company.
-
-IMPORTANT: The customer profile JSON has ALREADY been provided by the previous agent in this conversation.
-DO NOT call get_customer_data - the complete customer data is already in the conversation context.
-
-Your task:
-1. Read the customer profile from the previous agent's output
-2. Analyze their behavior, value, and engagement patterns
-3. Provide a structured behavioral analysis
-
-Include in your analysis:
-- Customer Summary: 2-3 sentence overview
-- Purchase Intent: low/medium/high (based on engagement score and recent activity)
-- Brand Loyalty: low/medium/high (based on total orders and tenure)
-- Price Sensitivity: low/medium/high (based on discount usage if available)
-- Churn Risk Assessment: Based on days_since_last_purchase and churn_risk field
-- Urgency Score: 0.0-1.0 (how urgently we should engage)
-- Recommended Action Priority: low/medium/high/critical
-
-KEY DECISION RULES:
-- High churn risk + High lifetime value = CRITICAL priority
-- Cart abandoned = HIGH urgency (0.8-1.0)
-- Low engagement + Many days since purchase = Medium urgency (0.5-0.7)
-- Active engaged customers = Low urgency (0.2-0.4)
-
-Provide clear, actionable insights for the marketing team.""",
-    output_key="customer_analysis",  # Session state key
-    tools=[]  # No tools - reads from session state
-)
-
-print("[OK] CustomerProfilerAgent created with ADK")
+def get_runner() -> InMemoryRunner:
+    """Return this agent's shared runner, creating it on first use."""
+    return shared_runner(get_app())
+
+
+# Module attributes built on first access, so importing this module stays cheap
+_LAZY_ATTRIBUTES = {
+    "customer_profiler_agent": get_agent,
+    "profiler_app": get_app,
+    "profiler_runner": get_runner,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # ============================================================================
 # STANDALONE TESTING
@@ -115,7 +112,7 @@ async def test_agent():
     """Test the customer profiler agent with sample data."""
     print("\n[Testing Customer Profiler Agent with ADK]\n")
     
-    runner = InMemoryRunner(agent=customer_profiler_agent)
+    runner = get_runner()
     
     # Sample customer profile for testing
     sample_profile = {
@@ -133,8 +130,8 @@ async def test_agent():
         "churn_risk": "high"
     }
     
-    prompt = f"Analyze this customer profile:\n{sample_profile}"
-    response = await runner.run_debug(prompt)
+    prompt = f"Analyze this customer profile:\n{to_json(sample_profile, indent=True, sort_keys=True)}"
+    response = await runner.run_debug(prompt, session_id=new_session_id())
     
     print("\n[Analysis Complete]")
     print(response)
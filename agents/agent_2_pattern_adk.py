@@ -49,8 +49,8 @@ Example Output:
 Author: NBA AI Team
 """
 
-import os
-import sys
+import functools
+import logging
 import asyncio
 from dotenv import load_dotenv
 
@@ -58,76 +58,75 @@ from dotenv import load_dotenv
 # ADK IMPORTS
 # ============================================================================
 from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
+from google.adk.apps import App
 from google.adk.runners import InMemoryRunner
 from google.adk.tools import FunctionTool
-from google.genai import types
 
 # ============================================================================
 # ENVIRONMENT SETUP
 # ============================================================================
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Shared ADK setup (context caching, inference tiers)
+from agents.common import make_app, tier_config, FLEX_TIER, new_session_id, make_model, shared_runner, load_prompt
+
 # Import historical patterns tool
-from tools.historical_patterns_tool import query_historical_patterns, find_similar_customer_segment
+from tools.historical_patterns_tool import (
+    query_historical_patterns,
+    find_similar_customer_segment,
+    query_action_history,
+)
 
 # ============================================================================
-# RETRY CONFIGURATION
+# AGENT DEFINITION
 # ============================================================================
-retry_config = types.HttpRetryOptions(
-    attempts=5,
-    exp_base=7,
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504],
-)
+@functools.cache
+def get_agent() -> Agent:
+    """Build the pattern matcher agent on first use (one instance per process)."""
+    agent = Agent(
+        name="PatternMatcherAgent",
+        model=make_model(tier=FLEX_TIER),
+        generate_content_config=tier_config(FLEX_TIER),  # Background analytics
+        instruction=load_prompt("pattern"),
+        output_key="historical_match",  # Session state key
+        tools=[
+            FunctionTool(query_historical_patterns),
+            FunctionTool(find_similar_customer_segment),
+            FunctionTool(query_action_history)
+        ]
+    )
+    logger.debug("PatternMatcherAgent created with ADK")
+    return agent
+
+
+@functools.cache
+def get_app() -> App:
+    """App with context caching - shared so the cached instruction prefix is reused."""
+    return make_app(get_agent())
 
 # ============================================================================
-# AGENT DEFINITION
+# RUNNER
 # ============================================================================
-pattern_matcher_agent = Agent(
-    name="PatternMatcherAgent",
-    model=Gemini(
-        model="gemini-2.5-flash-lite",
-        retry_options=retry_config
-    ),
-    instruction="""You are a marketing intelligence analyst specializing in historical pattern analysis.
-
-Your task:
-1. Read the customer profile and behavioral analysis from previous agents
-2. Identify the customer's segment, behavior type, and scenario
-3. Call get_historical_patterns to retrieve relevant past campaign data
-4. Analyze which marketing actions worked best for similar customers
-5. Provide recommendations based on historical success rates
-
-When analyzing historical patterns:
-- Look for segment matches (value_conscious, premium, vip)
-- Consider behavior similarity (cart_abandoner, churn_risk, etc.)
-- Prioritize actions with high conversion rates (>40%)
-- Note sample sizes (larger = more reliable)
-- Identify winning combinations (channel + action type)
-
-Output format:
-{
-  "matched_scenario": "scenario name",
-  "historical_success_rate": 0.XX,
-  "top_performing_actions": ["action1", "action2"],
-  "recommended_channels": ["email", "sms"],
-  "average_roi": "X.XX",
-  "confidence": "high|medium|low",
-  "sample_size": number_of_past_matches
+def get_runner() -> InMemoryRunner:
+    """Return this agent's shared runner, creating it on first use."""
+    return shared_runner(get_app())
+
+
+# Module attributes built on first access, so importing this module stays cheap
+_LAZY_ATTRIBUTES = {
+    "pattern_matcher_agent": get_agent,
+    "pattern_app": get_app,
+    "pattern_runner": get_runner,
 }
 
-IMPORTANT: Base recommendations on DATA, not assumptions. If historical data shows
-email outperforms SMS for a segment, recommend email even if SMS seems intuitive.""",
-    output_key="historical_match",  # Session state key
-    tools=[
-        FunctionTool(query_historical_patterns),
-        FunctionTool(find_similar_customer_segment)
-    ]
-)
 
-print("[OK] PatternMatcherAgent created with ADK")
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # ============================================================================
 # STANDALONE TESTING
@@ -136,7 +135,7 @@ async def test_agent():
     """Test the pattern matcher agent."""
     print("\n[Testing Pattern Matcher Agent]\n")
     
-    runner = InMemoryRunner(agent=pattern_matcher_agent)
+    runner = get_runner()
     
     prompt = """Analyze historical patterns for this customer:
     Segment: premium
@@ -145,7 +144,7 @@ async def test_agent():
     
     Find similar past campaigns and success rates."""
     
-    response = await runner.run_debug(prompt)
+    response = await runner.run_debug(prompt, session_id=new_session_id())
     
     print("\n[Pattern Matching Complete]")
     print(response)
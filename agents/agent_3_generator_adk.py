@@ -69,81 +69,99 @@ Example Output:
 Author: NBA AI Team
 """
 
-import os
-import sys
+import functools
+import logging
+import time
 import asyncio
+from typing import AsyncIterator, Dict
 from dotenv import load_dotenv
 
 # ============================================================================
 # ADK IMPORTS
 # ============================================================================
 from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
+from google.adk.apps import App
 from google.adk.runners import InMemoryRunner
-from google.genai import types
 
 # ============================================================================
 # ENVIRONMENT SETUP
 # ============================================================================
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Shared ADK setup (context caching, inference tiers)
+from agents.common import make_app, tier_config, PRIORITY_TIER, make_model, shared_runner, load_prompt
+from agents.common import stream_response_text, JsonObjectStream, as_action_list
+
 # ============================================================================
-# RETRY CONFIGURATION
+# AGENT DEFINITION
 # ============================================================================
-retry_config = types.HttpRetryOptions(
-    attempts=5,
-    exp_base=7,
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504],
-)
+@functools.cache
+def get_agent() -> Agent:
+    """Build the action generator agent on first use (one instance per process)."""
+    agent = Agent(
+        name="ActionGeneratorAgent",
+        model=make_model(tier=PRIORITY_TIER),
+        generate_content_config=tier_config(PRIORITY_TIER),  # Critical response path
+        instruction=load_prompt("generator"),
+        output_key="generated_actions",  # Session state key
+        tools=[]  # No tools - synthesizes from previous agents' outputs
+    )
+    logger.debug("ActionGeneratorAgent created with ADK")
+    return agent
+
+
+@functools.cache
+def get_app() -> App:
+    """App with context caching - shared so the cached instruction prefix is reused."""
+    return make_app(get_agent())
 
 # ============================================================================
-# AGENT DEFINITION
+# RUNNER
 # ============================================================================
-action_generator_agent = Agent(
-    name="ActionGeneratorAgent",
-    model=Gemini(
-        model="gemini-2.5-flash-lite",
-        retry_options=retry_config
-    ),
-    instruction="""You are a creative marketing strategist for an e-commerce company.
-
-Your task:
-1. Read customer profile, behavioral analysis, and historical patterns from previous agents
-2. Generate 4-5 DIVERSE marketing action options
-3. Each action should have a different approach (channel, offer, urgency)
-
-For EACH action, provide:
-- action_id: 1-5
-- action_type: "email_discount" | "sms_reminder" | "push_notification" | "retargeting_ad" | "value_email"
-- channel: "email" | "sms" | "push" | "retargeting"
-- offer_details: specific discount/product/benefit
-- message_theme: "urgency" | "value" | "social_proof" | "scarcity" | "personalization"
-- timing_window: "24_hours" | "48_hours" | "7_days"
-- estimated_cost: in rupees
-- target_segment: customer segment this targets
-
-DIVERSITY REQUIREMENTS:
-- Include at least 1 high-discount option (15-20%)
-- Include at least 1 low/no-discount option
-- Use at least 2 different channels
-- Mix urgent (24hr) and relaxed (7-day) timings
-- Vary message themes
-
-SCENARIO-SPECIFIC STRATEGIES:
-- **Cart Abandoner**: Urgent reminder + discount (24-48hr)
-- **Churn Risk**: Win-back with compelling offer + value messaging
-- **VIP Customer**: Exclusive access, early preview, premium service
-- **First-time Visitor**: Welcome discount, easy onboarding
-- **Repeat Customer**: Loyalty reward, replenishment reminder
-
-Output as JSON array of 4-5 actions, ordered from most to least recommended based on historical data.""",
-    output_key="generated_actions",  # Session state key
-    tools=[]  # No tools - synthesizes from previous agents' outputs
-)
-
-print("[OK] ActionGeneratorAgent created with ADK")
+def get_runner() -> InMemoryRunner:
+    """Return this agent's shared runner, creating it on first use."""
+    return shared_runner(get_app())
+
+
+# Module attributes built on first access, so importing this module stays cheap
+_LAZY_ATTRIBUTES = {
+    "action_generator_agent": get_agent,
+    "generator_app": get_app,
+    "generator_runner": get_runner,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ============================================================================
+# STREAMING
+# ============================================================================
+async def stream_actions(prompt: str) -> AsyncIterator[Dict]:
+    """
+    Generate actions with streaming, yielding each one as soon as it is complete.
+
+    Lets Cluster 2 start validating the first action while the rest of the
+    list is still being generated.
+
+    Args:
+        prompt: Generation prompt (customer, analysis and historical context)
+
+    Yields:
+        Action dicts in the order the model writes them
+    """
+    objects = JsonObjectStream()
+    async for chunk in stream_response_text(get_runner(), prompt):
+        for obj in objects.feed(chunk):
+            # A wrapper object ({"actions": [...]}) only completes at the end
+            for action in as_action_list(obj) if "action_id" not in obj else [obj]:
+                yield action
+
 
 # ============================================================================
 # STANDALONE TESTING
@@ -152,8 +170,6 @@ async def test_agent():
     """Test the action generator agent."""
     print("\n[Testing Action Generator Agent]\n")
     
-    runner = InMemoryRunner(agent=action_generator_agent)
-    
     prompt = """Generate marketing actions for:
     Customer: Premium segment, cart abandoner
     Cart Value: ₹3500 (electronics)
@@ -162,10 +178,14 @@ async def test_agent():
     
     Create 4-5 diverse action options."""
     
-    response = await runner.run_debug(prompt)
+    start = time.perf_counter()
+    actions = []
+    async for action in stream_actions(prompt):
+        print(f"[{time.perf_counter() - start:.2f}s] Action {action.get('action_id')}: {action.get('action_type')}")
+        actions.append(action)
     
-    print("\n[Action Generation Complete]")
-    print(response)
+    print(f"\n[Action Generation Complete] {len(actions)} actions")
+    return actions
 
 if __name__ == "__main__":
     asyncio.run(test_agent())
@@ -0,0 +1,107 @@
+"""
+Agents 4-5: Fused Validation + Scoring Node
+============================================
+
+Purpose:
+--------
+Runs the business rules validator (Agent 4) and the ROI scorer (Agent 5) as a
+single Cluster 2 node.
+
+Why Fused:
+----------
+Both agents read the same `generated_actions` and customer profile and neither
+needs a model call (rules engine + Numba ROI kernel). Running them as two
+ParallelAgent branches parsed the same state twice and emitted two events; this
+node parses the inputs once and writes both results in ONE event.
+
+Role in NBA AI:
+---------------
+- Replaces the Agent 4 + Agent 5 ParallelAgent as Cluster 2
+- Receives: generated_actions, generated_customer_profile
+- Outputs: validation_results, scored_actions (same keys as before)
+- Feeds to: Cluster 3 (Execution)
+
+Author: NBA AI Team
+"""
+
+import functools
+import logging
+import time
+from typing import AsyncGenerator
+
+# ============================================================================
+# ADK IMPORTS
+# ============================================================================
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+# ============================================================================
+# ENVIRONMENT SETUP
+# ============================================================================
+logger = logging.getLogger(__name__)
+
+from agents.common import parse_json_output, as_action_list, to_json
+from agents.agent_4_validator_adk import validate_actions
+from agents.agent_5_scorer_adk import score_generated_actions
+
+# ============================================================================
+# AGENT DEFINITION
+# ============================================================================
+class ScorerPlusRulesAgent(BaseAgent):
+    """Validates and scores generated actions in one step - no model call."""
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        actions = as_action_list(parse_json_output(state.get("generated_actions")))
+        customer = parse_json_output(state.get("generated_customer_profile"))
+        customer = customer if isinstance(customer, dict) else None
+
+        start = time.perf_counter()
+        validation = to_json(validate_actions(actions, customer), indent=True)
+        validated = time.perf_counter()
+        scoring = to_json(
+            score_generated_actions(actions, customer.get("segment") if customer else None),
+            indent=True
+        )
+        # Both steps are in-process CPU work - timings show there is no I/O to overlap
+        logger.debug(
+            "%s: validated %d actions in %.2f ms, scored in %.2f ms",
+            self.name, len(actions),
+            (validated - start) * 1000, (time.perf_counter() - validated) * 1000
+        )
+
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=scoring)]),
+            actions=EventActions(state_delta={
+                "validation_results": validation,
+                "scored_actions": scoring,
+            }),
+        )
+
+
+@functools.cache
+def get_agent() -> ScorerPlusRulesAgent:
+    """Build the fused validation + scoring node on first use (one instance per process)."""
+    agent = ScorerPlusRulesAgent(
+        name="ScorerPlusRulesAgent",
+        description="Business rules validation and ROI scoring of generated actions"
+    )
+    logger.debug("ScorerPlusRulesAgent created (rules engine + Numba ROI kernel)")
+    return agent
+
+
+# Module attributes built on first access, so importing this module stays cheap
+_LAZY_ATTRIBUTES = {
+    "scorer_plus_rules_agent": get_agent,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,7 +10,7 @@ it ensures actions are legal, affordable, and feasible.
 
 Role in NBA AI:
 ---------------
-- First agent in Cluster 2 (Validation) - runs in PARALLEL with Agent 5
+- First half of Cluster 2 (Validation) - fused with Agent 5 in agent_4_5_scorer_rules_adk
 - Receives: Generated actions from Agent 3
 - Outputs: Validation results (pass/fail) for each  action
 - Feeds to: Cluster 3 (Execution Planning)
@@ -24,16 +24,18 @@ Key Responsibilities:
 5. Filter out invalid actions
 6. Flag actions that need additional approval
 
-Tools Used:
------------
-- None - Uses built-in reasoning based on standard business rules
+Implementation:
+---------------
+- Deterministic Python rules engine - no LLM call. These checks are a handful
+  of dict comparisons, so running them in code removes a full Gemini
+  round-trip per customer and makes results reproducible.
 
 Validation Rules:
 -----------------
-- **Budget**: Actions over $10 per customer flagged as expensive
-- **Channels**: Email/SMS generally allowed, Push notifications typically not opted-in
+- **Budget**: Actions over ₹850 per customer flagged as expensive
+- **Channels**: Email/SMS allowed, Push only if the customer opted in
 - **Compliance**: Follow anti-spam regulations
-- **Cost**: Flag actions with estimated_cost > $10
+- **Cost**: Flag actions with estimated_cost > ₹850 (Agent 3 quotes costs in rupees)
 
 Output:
 -------
@@ -62,100 +64,189 @@ Why This Matters:
 Author: NBA AI Team
 """
 
-import os
-import sys
+import functools
+import logging
 import asyncio
+from typing import AsyncGenerator, Dict, List, Optional
 from dotenv import load_dotenv
 
 # ============================================================================
 # ADK IMPORTS
 # ============================================================================
-from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.apps import App
 from google.adk.runners import InMemoryRunner
 from google.genai import types
 
 # ============================================================================
 # ENVIRONMENT SETUP
 # ============================================================================
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Shared ADK setup (output parsing)
+from agents.common import parse_json_output, as_action_list, parse_cost, make_app, to_json, shared_runner
+
 # ============================================================================
-# RETRY CONFIGURATION
+# BUSINESS RULES
 # ============================================================================
-retry_config = types.HttpRetryOptions(
-    attempts=5,
-    exp_base=7,
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504],
-)
+ALLOWED_CHANNELS = {"email", "sms"}   # Opted in by default
+MAX_COST_PER_CUSTOMER = 850.0         # Rupees, like Agent 3's estimated_cost (~$10)
+
+
+def validate_action(action: Dict, customer: Optional[Dict] = None) -> Dict:
+    """
+    Validate a single generated action against business rules.
+    
+    Args:
+        action: One action generated by Agent 3
+        customer: Customer profile (used for push opt-in status)
+        
+    Returns:
+        {"action_id", "valid", "reason"}
+    """
+    customer = customer or {}
+    channel = str(action.get("channel", "")).lower()
+    cost = parse_cost(action.get("estimated_cost", 0))
+    
+    if channel == "push" and not customer.get("push_opted_in"):
+        valid, reason = False, "Push channel not opted in"
+    elif channel not in ALLOWED_CHANNELS and channel != "push":
+        valid, reason = False, f"Channel '{channel}' not permitted"
+    elif cost > MAX_COST_PER_CUSTOMER:
+        valid, reason = False, f"Estimated cost ₹{cost:.2f} exceeds ₹{MAX_COST_PER_CUSTOMER:.0f} limit"
+    else:
+        valid, reason = True, "Passed all checks"
+    
+    return {"action_id": action.get("action_id"), "valid": valid, "reason": reason}
+
+
+def summarize_validation(validated: List[Dict]) -> Dict:
+    """Build the "validation_results" shape from per-action results."""
+    passed_ids = [v["action_id"] for v in validated if v["valid"]]
+    failed_ids = [v["action_id"] for v in validated if not v["valid"]]
+    
+    return {
+        "validated_actions": validated,
+        "passed_action_ids": passed_ids,
+        "failed_action_ids": failed_ids,
+        "compliance_summary": f"{len(passed_ids)} out of {len(validated)} actions passed validation"
+    }
+
+
+def validate_actions(actions: List[Dict], customer: Optional[Dict] = None) -> Dict:
+    """
+    Validate generated marketing actions against business rules.
+    
+    Args:
+        actions: Actions generated by Agent 3
+        customer: Customer profile (used for push opt-in status)
+        
+    Returns:
+        Validation results in the "validation_results" shape
+    """
+    return summarize_validation([validate_action(action, customer) for action in actions])
+
+
+async def validate_action_stream(actions: asyncio.Queue, customer: Optional[Dict] = None) -> Dict:
+    """
+    Validate actions as they arrive from a streaming generator.
+    
+    Args:
+        actions: Queue of action dicts, terminated by None
+        customer: Customer profile (used for push opt-in status)
+        
+    Returns:
+        Validation results in the "validation_results" shape
+    """
+    validated = []
+    while (action := await actions.get()) is not None:
+        validated.append(validate_action(action, customer))
+    return summarize_validation(validated)
+
 
 # ============================================================================
 # AGENT DEFINITION
 # ============================================================================
-validator_agent = Agent(
-    name="ValidatorAgent",
-    model=Gemini(
-        model="gemini-2.5-flash-lite",
-        retry_options=retry_config
-    ),
-    instruction="""You are a compliance and business rules specialist.
-
-Your task:
-1. Read the generated marketing actions from the previous agent's output
-2. For EACH action in the list, check if it passes business rules
-3. Summarize which actions are valid and which are not
-
-Business rules checks:
-- Email/SMS channels: Customer must have opted in (check compliance)
-- Push notifications: Generally not permitted unless explicitly opted in  
-- Budget: Actions with estimated_cost > $10 per customer are too expensive
-- All actions must follow anti-spam regulations
-
-Output a JSON object with:
-{
-  "validated_actions": [
-    {"action_id": 1, "valid": true, "reason": "Passed all checks"},
-    {"action_id": 2, "valid": false, "reason": "Push channel not opted in"},
-    ...
-  ],
-  "passed_action_ids": [1, 3, 4],
-  "failed_action_ids": [2],
-  "compliance_summary": "3 out of 4 actions passed validation"
+class RulesValidatorAgent(BaseAgent):
+    """Runs validate_actions on session state - no model call."""
+    
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        actions = as_action_list(parse_json_output(state.get("generated_actions")))
+        customer = parse_json_output(state.get("generated_customer_profile"))
+        
+        results = validate_actions(actions, customer if isinstance(customer, dict) else None)
+        output = to_json(results, indent=True)
+        
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=output)]),
+            actions=EventActions(state_delta={"validation_results": output}),
+        )
+
+
+@functools.cache
+def get_agent() -> RulesValidatorAgent:
+    """Build the rules validator agent on first use (one instance per process)."""
+    agent = RulesValidatorAgent(
+        name="ValidatorAgent",
+        description="Deterministic business rules validation of generated actions"
+    )
+    logger.debug("ValidatorAgent created (deterministic rules engine)")
+    return agent
+
+
+@functools.cache
+def get_app() -> App:
+    """App wrapping the agent - shared by every runner in this process."""
+    return make_app(get_agent())
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+def get_runner() -> InMemoryRunner:
+    """Return this agent's shared runner, creating it on first use."""
+    return shared_runner(get_app())
+
+
+# Module attributes built on first access, so importing this module stays cheap
+_LAZY_ATTRIBUTES = {
+    "validator_agent": get_agent,
+    "validator_app": get_app,
+    "validator_runner": get_runner,
 }
 
-IMPORTANT:
-- Email and SMS are generally valid channels
-- Push notifications typically fail (customer not opted in)
-- Actions over $10 estimated_cost should be flagged
-- Always explain why an action failed""",
-    output_key="validation_results",
-    tools=[]  # No tools needed - agent will use built-in reasoning
-)
 
-print("[OK] ValidatorAgent created with ADK")
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # ============================================================================
 # STANDALONE TESTING
 # ============================================================================
 async def test_agent():
-    """Test the validator agent."""
+    """Test the validator rules."""
     print("\n[Testing Validator Agent]\n")
     
-    runner = InMemoryRunner(agent=validator_agent)
-    
-    prompt = """Validate these marketing actions:
-    Action 1: Email with 15% discount to premium customer (cost: $5)
-    Action 2: SMS to customer (cost: $3)
-    Action 3: Push notification for in-stock product (cost: $2)
-    
-    Check all business rules."""
+    actions = [
+        {"action_id": 1, "channel": "email", "estimated_cost": 575},
+        {"action_id": 2, "channel": "sms", "estimated_cost": 120},
+        {"action_id": 3, "channel": "push", "estimated_cost": 40},
+        {"action_id": 4, "channel": "email", "estimated_cost": "₹1,500"},
+    ]
     
-    response = await runner.run_debug(prompt)
+    response = validate_actions(actions)
     
     print("\n[Validation Complete]")
-    print(response)
+    print(to_json(response, indent=True))
 
 if __name__ == "__main__":
     asyncio.run(test_agent())
@@ -9,7 +9,7 @@ it predicts which actions will generate the best return on investment.
 
 Role in NBA AI:
 ---------------
-- Second agent in Cluster 2 (Scoring) - runs in PARALLEL with Agent 4
+- Second half of Cluster 2 (Scoring) - fused with Agent 4 in agent_4_5_scorer_rules_adk
 - Receives: Generated actions from Agent 3
 - Outputs: ROI scores and ranked recommendations
 - Feeds to: Cluster 3 (Execution Planning)
@@ -30,6 +30,12 @@ Scoring Criteria:
 - **Cost-Effectiveness**: Estimated cost vs expected return
 - **Timing**: Urgency and customer readiness
 
+Implementation:
+---------------
+Predicted ROI = historical conversion x segment CLV x channel weight - cost,
+computed by a Numba-compiled kernel (tools/scoring_kernels.py) over all actions
+at once. No LLM call - scores are deterministic and testable.
+
 Output:
 -------
 Scored and ranked actions, stored under "scored_actions" key.
@@ -38,14 +44,19 @@ Example Output:
 ---------------
 {
   "scored_actions": [
-    {"action_id": 1, "roi_score": 8.5, "rank": 1, "predicted_roi": "$45"},
-    {"action_id": 3, "roi_score": 7.2, "rank": 2, "predicted_roi": "$32"},
-    {"action_id": 2, "roi_score": 5.1, "rank": 3, "predicted_roi": "$18"},
+    {"action_id": 2, "roi_score": 10.0, "rank": 1, "predicted_roi": 1054.5,
+     "reasoning": "sms channel, 30% historical conversion, cost 120.00"},
+    {"action_id": 3, "roi_score": 9.0, "rank": 2, "predicted_roi": 945.5,
+     "reasoning": "push channel, 30% historical conversion, cost 40.00"},
+    {"action_id": 1, "roi_score": 5.2, "rank": 3, "predicted_roi": 550.0,
+     "reasoning": "email channel, 25% historical conversion, cost 575.00"}
   ],
-  "top_recommendations": [1, 3],
-  "scoring_summary": "Email discount action rated highest (8.5/10)"
+  "top_recommendations": [2, 3, 1],
+  "scoring_summary": "Top action: sms_reminder via sms (score: 10.0/10)"
 }
 
+predicted_roi is a float in the same currency as estimated_cost (rupees).
+
 Why This Matters:
 -----------------
 - Maximizes marketing ROI
@@ -57,107 +68,207 @@ Why This Matters:
 Author: NBA AI Team
 """
 
-import os
-import sys
+import functools
+import logging
 import asyncio
+from typing import AsyncGenerator, Dict, List, Optional
 from dotenv import load_dotenv
 
+import numpy as np
+
 # ============================================================================
 # ADK IMPORTS
 # ============================================================================
-from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.apps import App
 from google.adk.runners import InMemoryRunner
 from google.genai import types
 
 # ============================================================================
 # ENVIRONMENT SETUP
 # ============================================================================
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Shared ADK setup (output parsing)
+from agents.common import parse_json_output, as_action_list, parse_cost, make_app, to_json, shared_runner
+
+# Import scoring kernel and historical performance data
+from tools.scoring_kernels import score_actions, encode_channels, SEGMENT_CLV, DEFAULT_SEGMENT_CLV
+from tools.analytics_tool import get_action_performance_by_types
+
 # ============================================================================
-# RETRY CONFIGURATION
+# SCORING
 # ============================================================================
-retry_config = types.HttpRetryOptions(
-    attempts=5,
-    exp_base=7,
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504],
-)
+DEFAULT_CONVERSION_RATE = 0.3  # Used when an action type has no history
+TOP_N_RECOMMENDATIONS = 3
+
+
+def _historical_conversions(action_types: List[str]) -> Dict[str, float]:
+    """Historical conversion rate (0.0-1.0) per action type, from one history load."""
+    rates = {}
+    for action_type, perf in get_action_performance_by_types(action_types).items():
+        if not perf.get("total_actions"):
+            rates[action_type] = DEFAULT_CONVERSION_RATE
+        else:
+            rates[action_type] = perf.get("conversion_rate", 0) / 100
+    return rates
+
+
+def score_generated_actions(actions: List[Dict], segment: Optional[str] = None) -> Dict:
+    """
+    Score and rank generated actions by predicted ROI.
+    
+    Args:
+        actions: Actions generated by Agent 3
+        segment: Customer segment (value_conscious, premium, vip)
+        
+    Returns:
+        Scoring results in the "scored_actions" shape
+    """
+    if not actions:
+        return {"scored_actions": [], "top_recommendations": [], "scoring_summary": "No actions to score"}
+    
+    channels = [a.get("channel", "email") for a in actions]
+    costs = np.array([parse_cost(a.get("estimated_cost", 0)) for a in actions], dtype=np.float64)
+    action_types = [a.get("action_type", "") for a in actions]
+    rates = _historical_conversions(list(dict.fromkeys(action_types)))
+    hist_conv = np.array([rates[t] for t in action_types], dtype=np.float64)
+    clv = np.full(len(actions), SEGMENT_CLV.get(segment, DEFAULT_SEGMENT_CLV), dtype=np.float64)
+    
+    roi = score_actions(costs, encode_channels(channels), clv, hist_conv)
+    
+    # Normalize to the 1-10 scale relative to the best action
+    best = roi.max()
+    scores = np.clip(10 * roi / best, 1, 10) if best > 0 else np.ones(len(actions))
+    
+    scored = []
+    for i in np.argsort(-roi, kind="stable"):
+        action = actions[i]
+        scored.append({
+            "action_id": action.get("action_id"),
+            "roi_score": round(float(scores[i]), 1),
+            "rank": len(scored) + 1,
+            "predicted_roi": round(float(roi[i]), 2),
+            "reasoning": (
+                f"{channels[i]} channel, {hist_conv[i]:.0%} historical conversion, "
+                f"cost {costs[i]:.2f}"
+            )
+        })
+    
+    top = scored[0]
+    top_action = actions[int(np.argmax(roi))]
+    return {
+        "scored_actions": scored,
+        "top_recommendations": [s["action_id"] for s in scored[:TOP_N_RECOMMENDATIONS]],
+        "scoring_summary": (
+            f"Top action: {top_action.get('action_type', 'unknown')} via "
+            f"{top_action.get('channel', 'email')} (score: {top['roi_score']}/10)"
+        )
+    }
+
+
+async def score_action_stream(actions: asyncio.Queue, segment: Optional[str] = None) -> Dict:
+    """
+    Score actions arriving from a streaming generator.
+    
+    ROI scores are relative to the best action, so scoring runs once the
+    stream ends; collecting overlaps with generation.
+    
+    Args:
+        actions: Queue of action dicts, terminated by None
+        segment: Customer segment (value_conscious, premium, vip)
+        
+    Returns:
+        Scoring results in the "scored_actions" shape
+    """
+    collected = []
+    while (action := await actions.get()) is not None:
+        collected.append(action)
+    return score_generated_actions(collected, segment)
+
 
 # ============================================================================
 # AGENT DEFINITION
 # ============================================================================
-scorer_agent = Agent(
-    name="ScorerAgent",
-    model=Gemini(
-        model="gemini-2.5-flash-lite",
-        retry_options=retry_config
-    ),
-    instruction="""You are a marketing ROI analyst and financial optimizer.
-
-Your task:
-1. Read the generated marketing actions from the previous agent
-2. Score EACH action on predicted ROI (1-10 scale)
-3. Rank actions from best to worst
-4. Recommend top 2-3 actions
-
-Scoring logic:
-- Email actions: Base score 7-8 (cheap, effective)
-- SMS actions: Base score 6-7 (moderate cost, good reach)
-- Push notifications: Base score 5-6 (low cost but lower engagement)
-- Discount offers: +1 score if discount is 10-20% (sweet spot)
-- Premium customers: +1 score (higher lifetime value)
-- Actions under $5 cost: +0.5 score (cost-effective)
-
-Output a JSON object with:
-{
-  "scored_actions": [
-    {
-      "action_id": 1,
-      "roi_score": 8.5,
-      "rank": 1,
-      "predicted_roi": "$45",
-      "reasoning": "Email channel is cost-effective, 15% discount in optimal range"
-    },
-    ...
-  ],
-  "top_recommendations": [1, 3],
-  "scoring_summary": "Top action: Email with 15% discount (score: 8.5/10)"
+class RoiScorerAgent(BaseAgent):
+    """Runs score_generated_actions on session state - no model call."""
+    
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        actions = as_action_list(parse_json_output(state.get("generated_actions")))
+        customer = parse_json_output(state.get("generated_customer_profile"))
+        segment = customer.get("segment") if isinstance(customer, dict) else None
+        
+        output = to_json(score_generated_actions(actions, segment), indent=True)
+        
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=output)]),
+            actions=EventActions(state_delta={"scored_actions": output}),
+        )
+
+
+@functools.cache
+def get_agent() -> RoiScorerAgent:
+    """Build the ROI scorer agent on first use (one instance per process)."""
+    agent = RoiScorerAgent(
+        name="ScorerAgent",
+        description="ROI scoring and ranking of generated actions"
+    )
+    logger.debug("ScorerAgent created (Numba ROI kernel)")
+    return agent
+
+
+@functools.cache
+def get_app() -> App:
+    """App wrapping the agent - shared by every runner in this process."""
+    return make_app(get_agent())
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+def get_runner() -> InMemoryRunner:
+    """Return this agent's shared runner, creating it on first use."""
+    return shared_runner(get_app())
+
+
+# Module attributes built on first access, so importing this module stays cheap
+_LAZY_ATTRIBUTES = {
+    "scorer_agent": get_agent,
+    "scorer_app": get_app,
+    "scorer_runner": get_runner,
 }
 
-IMPORTANT:
-- Always rank actions from highest to lowest score
-- Top 2-3 actions should have scores >= 7.0
-- Explain your reasoning for scores
-- Consider both cost and expected return""",
-    output_key="scored_actions",
-    tools=[]  # No tools needed - agent uses built-in reasoning
-)
 
-print("[OK] ScorerAgent created with ADK")
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # ============================================================================
 # STANDALONE TESTING
 # ============================================================================
 async def test_agent():
-    """Test the scorer agent."""
+    """Test the scorer."""
     print("\n[Testing Scorer Agent]\n")
     
-    runner = InMemoryRunner(agent=scorer_agent)
-    
-    prompt = """Score these marketing actions:
-    Action 1: Email with 15% discount (cost: $5, premium customer)
-    Action 2: SMS reminder (cost: $3)
-    Action 3: Push notification (cost: $2)
-    
-    Rank them by predicted ROI."""
+    actions = [
+        {"action_id": 1, "action_type": "email_discount", "channel": "email", "estimated_cost": 5},
+        {"action_id": 2, "action_type": "sms_reminder", "channel": "sms", "estimated_cost": 3},
+        {"action_id": 3, "action_type": "push_notification", "channel": "push", "estimated_cost": 2},
+    ]
     
-    response = await runner.run_debug(prompt)
+    response = score_generated_actions(actions, segment="premium")
     
     print("\n[Scoring Complete]")
-    print(response)
+    print(to_json(response, indent=True))
 
 if __name__ == "__main__":
     asyncio.run(test_agent())
@@ -13,7 +13,7 @@ Role in NBA AI:
 - First agent in Cluster 3 (Execution)
 - Receives: Top-ranked action from Agents 4 & 5
 - Outputs: Optimal send date/time
-- Feeds to: Agent 7 (Content Creator)
+- Feeds to: Agent 8 (Human Approval), then Agent 7 (Content Creator)
 
 Key Responsibilities:
 ---------------------
@@ -74,98 +74,68 @@ Research-Backed Best Times:
 Author: NBA AI Team
 """
 
-import os
-import sys
 import asyncio
+import functools
+import logging
 from dotenv import load_dotenv
 from typing import Optional
 
 # ============================================================================
 # ADK IMPORTS
 # ============================================================================
-from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
+from google.adk.apps import App
 from google.adk.runners import InMemoryRunner
-from google.adk.tools import FunctionTool
-from google.genai import types
 
 # ============================================================================
 # ENVIRONMENT SETUP
 # ============================================================================
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Shared agent factory (one Gemini client and connection pool for all agents)
+from agents.common import make_agent, make_app, shared_runner, new_session_id, load_prompt
+
 # Import timing tool
 from tools.timing_intelligence_tool import calculate_send_time
 
 # ============================================================================
-# RETRY CONFIGURATION
+# AGENT DEFINITION
 # ============================================================================
-retry_config = types.HttpRetryOptions(
-    attempts=5,
-    exp_base=7,
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504],
+timing_agent = make_agent(
+    name="TimingAgent",
+    instruction=load_prompt("timing"),  # agents/prompts/timing.txt
+    output_key="optimal_timing",  # Session state key
+    context_keys=["generated_customer_profile", "generated_actions", "scored_actions"],  # Only what this agent reads
+    tools=[calculate_send_time]  # Timing calculation tool
 )
 
+logger.debug("TimingAgent created with ADK")
+
 # ============================================================================
-# AGENT DEFINITION
+# RUNNER
 # ============================================================================
-timing_agent = Agent(
-    name="TimingAgent",
-    model=Gemini(
-        model="gemini-2.5-flash-lite",
-        retry_options=retry_config
-    ),
-    instruction="""You are a timing optimization specialist for marketing campaigns.
-
-Your task:
-1. Read the selected marketing action from previous agents
-2. Identify action type, urgency, and customer segment
-3. Call calculate_send_time to determine optimal send datetime
-4. Provide clear scheduling recommendation
-
-Timing guidelines:
-- **High Urgency** (cart abandonment): 2-4 hours from now
-- **Medium Urgency** (churn win-back): Next business day, 10 AM-2 PM
-- **Low Urgency** (general promo): Customer's typical engagement time
-- **VIP Customers**: Evening (7-9 PM) for leisurely browsing
-- **First-time Customers**: Midday (11 AM-1 PM) during break times
-
-Day-of-week strategy:
-- **Best**: Tuesday, Wednesday, Thursday (highest engagement)
-- **Good**: Monday (new week energy), Friday AM (pre-weekend)
-- **Avoid**: Friday PM, Saturday, Sunday (unless retail/consumer)
-
-Output format:
-{
-  "recommended_send_datetime": "2025-01-22 19:30",
-  "timezone": "Asia/Kolkata",
-  "day_of_week": "Wednesday",
-  "hours_from_now": 4,
-  "reasoning": "Cart abandonment requires urgent follow-up within 4 hours. Customer historically opens evening emails.",
-  "alternative_time": "2025-01-23 10:00" (if recommended time is not feasible)
-}
+@functools.cache
+def get_app() -> App:
+    """App wrapping the agent - shared by every runner in this process."""
+    return make_app(timing_agent)
 
-IMPORTANT:
-- Never schedule for past times
-- Respect "do not disturb" hours (11 PM - 6 AM)
-- Consider customer's timezone (not system timezone)
-- Urgent actions override best-time optimization""",
-    output_key="optimal_timing",  # Session state key
-    tools=[FunctionTool(calculate_send_time)]  # Timing calculation tool
-)
 
-print("[OK] TimingAgent created with ADK")
+def get_runner() -> InMemoryRunner:
+    """Return this agent's shared runner, creating it on first use."""
+    return shared_runner(get_app())
 
 # ============================================================================
 # STANDALONE TESTING
 # ============================================================================
-async def test_agent():
-    """Test the timing agent."""
-    print("\n[Testing Timing Agent]\n")
+def make_test_run(quiet: bool = False):
+    """
+    Build the standalone test run for the timing agent without awaiting it.
     
-    runner = InMemoryRunner(agent=timing_agent)
+    Returns the `run_debug` coroutine so a harness can run several agent
+    tests concurrently (see scripts/run_all_agents.py).
+    """
+    runner = get_runner()
     
     prompt = """Calculate optimal send time for:
     Action: Cart abandonment email
@@ -175,7 +145,14 @@ async def test_agent():
     
     Determine best send datetime."""
     
-    response = await runner.run_debug(prompt)
+    return runner.run_debug(prompt, session_id=new_session_id(), quiet=quiet)
+
+
+async def test_agent():
+    """Test the timing agent."""
+    print("\n[Testing Timing Agent]\n")
+    
+    response = await make_test_run()
     
     print("\n[Timing Optimization Complete]")
     print(response)
@@ -10,10 +10,11 @@ messages that convert.
 
 Role in NBA AI:
 ---------------
-- Second agent in Cluster 3 (Execution)
-- Receives: Action details + optimal timing from Agents 6 and previous agents
+- Third agent in Cluster 3 (Execution) - AFTER human approval
+- Receives: Action details + optimal timing from Agent 6, approval from Agent 8
 - Outputs: Complete marketing message (subject + body)
-- Feeds to: Agent 8 (Human Approval)
+- Feeds to: Agent 9 (Results Tracker)
+- Skipped entirely (no model call) when Agent 8 rejected the action
 
 Key Responsibilities:
 ---------------------
@@ -50,7 +51,9 @@ Content Best Practices:
 
 Output:
 -------
-Marketing content ready for approval, stored under "marketing_content" key.
+Marketing content ready for tracking, stored under "marketing_content" key.
+`stream_content()` streams the same message field by field (subject first),
+so a preview can be shown while the body is still being written.
 
 Example Output (Email):
 -----------------------
@@ -71,125 +74,129 @@ Why This Matters:
 Author: NBA AI Team
 """
 
-import os
-import sys
 import asyncio
+import functools
+import logging
+import time
+from typing import Any, AsyncIterator, List, Optional, Tuple
 from dotenv import load_dotenv
 
+from pydantic import BaseModel
+
 # ============================================================================
 # ADK IMPORTS
 # ============================================================================
-from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
+from google.adk.apps import App
 from google.adk.runners import InMemoryRunner
-from google.genai import types
 
 # ============================================================================
 # ENVIRONMENT SETUP
 # ============================================================================
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Shared agent factory (one Gemini client and connection pool for all agents)
+from agents.common import make_agent, make_app, stream_response_text, JsonFieldStream, shared_runner, new_session_id, load_prompt
+
+# Approval gate - no copywriting for rejected actions
+from agents.agent_8_approval_adk import skip_if_rejected
+
 # ============================================================================
-# RETRY CONFIGURATION
+# OUTPUT SCHEMA
 # ============================================================================
-retry_config = types.HttpRetryOptions(
-    attempts=5,
-    exp_base=7,
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504],
-)
+class MarketingContent(BaseModel):
+    """Marketing message for the chosen channel (enforced by the decoder)."""
+    channel: str
+    subject: str
+    body: str
+    cta_text: str
+    discount_code: Optional[str] = None
+    personalization_elements: List[str]
+
 
 # ============================================================================
 # AGENT DEFINITION
 # ============================================================================
-content_agent = Agent(
+content_agent = make_agent(
     name="ContentAgent",
-    model=Gemini(
-        model="gemini-2.5-flash-lite",
-        retry_options=retry_config
-    ),
-    instruction="""You are an expert marketing copywriter specializing in personalized, high-converting messages.
-
-Your task:
-1. Read customer profile, selected action (top-ranked), and optimal timing from previous agents
-2. Create personalized marketing content for the chosen channel
-3. Ensure content is compelling, personalized, and action-oriented
-
-Content requirements by channel:
-
-**EMAIL:**
-- Subject line: Under 50 chars, benefit-driven, use emojis strategically
-- Body: 100-150 words, scannable, personal tone
-- Include customer's first name
-- Reference specific product they abandoned/browsed
-- Clear CTA button text
-- Include discount code if applicable
-
-**SMS:**
-- Maximum 160 characters total
-- Include discount code
-- Urgent but friendly tone
-- Clear CTA
-
-**PUSH NOTIFICATION:**
-- Headline: Under 40 chars
-- Body: Under 80 chars
-- Include emoji for attention
-
-Personalization tactics:
-- Use customer's first name
-- Reference specific products they viewed/added
-- Acknowledge their behavior ("We noticed you left X in your cart...")
-- Segment-specific language (Premium: "exclusive", New: "welcome")  
-- Include specific amounts (cart value, savings amount)
-- Time-sensitive language if urgent
-
-Conversion optimization:
-- Lead with benefit, not feature
-- Create urgency (limited time, scarcity)  
-- Use power words (save, exclusive, limited, free)
-- Make CTA obvious and actionable
-- Avoid spammy language or excessive punctuation
-
-Output a JSON object with:
-{
-  "channel": "email",
-  "subject": "Subject line here",
-  "body": "Email body content...",
-  "cta_text": "Shop Now",
-  "discount_code": "SAVE15" (if applicable),
-  "personalization_elements": ["name", "cart_value", "product"]
-}
-
-Be professional, engaging, and brand-appropriate.""",
+    instruction=load_prompt("content"),  # agents/prompts/content.txt
+    output_schema=MarketingContent,  # Sent as response_mime_type/response_schema
     output_key="marketing_content",
+    context_keys=["generated_customer_profile", "customer_analysis", "generated_actions", "scored_actions", "optimal_timing"],  # Only what this agent reads
+    before_agent_callback=skip_if_rejected,
     tools=[]  # No tools needed - use built-in copywriting capability
 )
 
-print("[OK] ContentAgent created with ADK")
+logger.debug("ContentAgent created with ADK")
 
 # ============================================================================
-# STANDALONE TESTING
+# STREAMING
 # ============================================================================
-async def test_agent():
-    """Test the content creator agent."""
-    print("\n[Testing Content Creator Agent]\n")
+@functools.cache
+def get_app() -> App:
+    """App wrapping the agent - shared by every runner in this process."""
+    return make_app(content_agent)
+
+
+def get_runner() -> InMemoryRunner:
+    """Return this agent's shared runner, creating it on first use."""
+    return shared_runner(get_app())
+
+
+async def stream_content(prompt: str) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Write marketing content with streaming, yielding each field once complete.
     
-    runner = InMemoryRunner(agent=content_agent)
+    Fields arrive in MarketingContent order, so the channel and subject line
+    are available while the body is still being generated.
     
-    prompt = """Create marketing content for:
+    Args:
+        prompt: Content brief (customer, selected action and timing)
+        
+    Yields:
+        (field name, value) pairs, e.g. ("subject", "Priya, your cart...")
+    """
+    fields = JsonFieldStream()
+    async for chunk in stream_response_text(get_runner(), prompt):
+        for field in fields.feed(chunk):
+            yield field
+
+# ============================================================================
+# STANDALONE TESTING
+# ============================================================================
+TEST_PROMPT = """Create marketing content for:
     Customer: Priya Sharma, premium segment
     Action: Email with 15% cart recovery discount
     Cart: ₹7,500 (Smartwatch Pro)
     Urgency: High (send today)
     
     Generate subject line and email body."""
+
+
+def make_test_run(quiet: bool = False):
+    """
+    Build the standalone test run for the content creator agent without awaiting it.
+    
+    Returns the `run_debug` coroutine so a harness can run several agent
+    tests concurrently (see scripts/run_all_agents.py).
+    """
+    runner = get_runner()
+    return runner.run_debug(TEST_PROMPT, session_id=new_session_id(), quiet=quiet)
+
+
+async def test_agent():
+    """Test the content creator agent, printing each field as it streams in."""
+    print("\n[Testing Content Creator Agent]\n")
     
-    response = await runner.run_debug(prompt)
+    start = time.perf_counter()
+    content = {}
+    async for field, value in stream_content(TEST_PROMPT):
+        print(f"[{time.perf_counter() - start:.2f}s] {field}: {value}")
+        content[field] = value
     
     print("\n[Content Creation Complete]")
-    print(response)
+    return content
 
 if __name__ == "__main__":
     asyncio.run(test_agent())
@@ -10,7 +10,7 @@ inappropriate messages.
 
 How HITL Works:
 ---------------
-1. Agent receives proposed action from Agent 7 (Content Creator)
+1. Agent receives the top-ranked action and send time from Agents 5 & 6
 2. Extracts action summary, cost, and expected ROI
 3. Calls request_human_approval() which:
    - PAUSES orchestrator execution ⏸️
@@ -18,7 +18,10 @@ How HITL Works:
    - Waits for YES/NO decision
 4. Human reviews and approves/rejects
 5. Execution RESUMES with decision ▶️
-6. Result passed to Agent 9 (Tracker)
+6. Result passed to Agent 7 (Content, only if approved) and Agent 9 (Tracker)
+
+Approval runs BEFORE content creation, so a rejected action never pays for
+the copywriting call: `skip_if_rejected` short-circuits Agent 7.
 
 Why This Matters:
 -----------------
@@ -39,14 +42,15 @@ Author: NBA AI Team
 
 import os
 import sys
+import logging
+from typing import Optional
 from dotenv import load_dotenv
 
 # ============================================================================
 # ADK IMPORTS
 # ============================================================================
-from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
-from google.adk.tools import ToolContext, FunctionTool
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.tools import ToolContext
 from google.genai import types
 
 # ============================================================================
@@ -54,15 +58,10 @@ from google.genai import types
 # ============================================================================
 load_dotenv()
 
-# ============================================================================
-# RETRY CONFIGURATION
-# ============================================================================
-retry_config = types.HttpRetryOptions(
-    attempts=5,
-    exp_base=7,
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504],
-)
+logger = logging.getLogger(__name__)
+
+# Shared agent factory (one Gemini client and connection pool for all agents)
+from agents.common import make_agent, load_prompt
 
 # ============================================================================
 # HITL APPROVAL FUNCTION
@@ -124,23 +123,41 @@ def request_human_approval(
         }
 
 # ============================================================================
-# AGENT DEFINITION
+# APPROVAL GATE
 # ============================================================================
-approval_agent = Agent(
-    name="HumanApprovalAgent",
-    model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
-    instruction="""You are the Human Approval Gateway for marketing actions.
+def is_rejected(approval_status) -> bool:
+    """True if Agent 8's output (the "approval_status" state value) is a rejection."""
+    return "REJECTED" in str(approval_status or "").upper()
+
+
+def skip_if_rejected(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    before_agent_callback for agents that only matter once an action is approved.
+    
+    Skips the agent (no model call) when the human rejected the action; runs it
+    normally when approved or when no approval has happened yet (standalone runs).
+    
+    Args:
+        callback_context: ADK callback context of the gated agent
+        
+    Returns:
+        Replacement content to skip the agent, or None to run it
+    """
+    if not is_rejected(callback_context.state.get("approval_status")):
+        return None
+    logger.debug("%s skipped: action rejected", callback_context.agent_name)
+    return types.Content(role="model", parts=[types.Part(text="{}")])
 
-Your task:
-1. Read the final marketing content and action details from the previous agents
-2. Extract: action summary, estimated cost, and expected ROI
-3. Call request_human_approval with these details
-4. If approved, output "APPROVED - Action can proceed"
-5. If rejected, output "REJECTED - Action cancelled"
 
-Always call the approval tool with clear, concise information.""",
+# ============================================================================
+# AGENT DEFINITION
+# ============================================================================
+approval_agent = make_agent(
+    name="HumanApprovalAgent",
+    instruction=load_prompt("approval"),  # agents/prompts/approval.txt
     output_key="approval_status",  # Session state key
-    tools=[FunctionTool(request_human_approval)]  # HITL tool
+    context_keys=["generated_actions", "validation_results", "scored_actions", "optimal_timing"],  # Only what this agent reads
+    tools=[request_human_approval]  # HITL tool
 )
 
-print("[OK] HumanApprovalAgent created with ADK (Agent 8)")
+logger.debug("HumanApprovalAgent created with ADK (Agent 8)")
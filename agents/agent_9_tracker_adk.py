@@ -24,14 +24,15 @@ Key Responsibilities:
 3. Record outcome status:
    - "scheduled" if APPROVED
    - "cancelled" if REJECTED
-4. Update historical_actions.json with new data point
+4. Append the new data point to historical_actions.jsonl
 5. Update historical_patterns summary for Agent 2
 6. Provide confirmation of successful recording
 
 Tools Used:
 -----------
 - record_result(): Saves action outcome to both files:
-  - historical_actions.json (detailed log)
+  - historical_actions.jsonl (append-only detailed log, periodically
+    compacted into historical_actions.json)
   - historical_patterns.json (aggregated insights)
 
 What Gets Recorded:
@@ -82,7 +83,7 @@ Why This Matters:
 
 Data Flow:
 ----------
-Agent 8 (Approval) → Agent 9 (Tracker) → historical_actions.json
+Agent 8 (Approval) → Agent 9 (Tracker) → historical_actions.jsonl
                                       → historical_patterns.json
                                       → Agent 2 (Pattern Matcher) reads this data
 
@@ -117,106 +118,93 @@ In production, Agent 9 would also:
 Author: NBA AI Team
 """
 
-import os
-import sys
 import asyncio
+import functools
+import logging
 from dotenv import load_dotenv
 
+from pydantic import BaseModel
+
 # ============================================================================
 # ADK IMPORTS
 # ============================================================================
-from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
+from google.adk.apps import App
 from google.adk.runners import InMemoryRunner
-from google.adk.tools import FunctionTool
-from google.genai import types
 
 # ============================================================================
 # ENVIRONMENT SETUP
 # ============================================================================
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Shared agent factory (one Gemini client and connection pool for all agents)
+from agents.common import make_agent, make_app, shared_runner, new_session_id, load_prompt
+
 # Import results tracking tool
 from tools.results_tracker_tool import record_result
 
 # ============================================================================
-# RETRY CONFIGURATION
+# OUTPUT SCHEMA
 # ============================================================================
-retry_config = types.HttpRetryOptions(
-    attempts=5,
-    exp_base=7,
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504],
-)
+class RecordedAction(BaseModel):
+    """The action as passed to record_result."""
+    customer_id: str
+    action_type: str
+    action_status: str  # "scheduled" or "cancelled"
+    timestamp: str
+    segment: str
+    predicted_roi: float
+
+
+class TrackingResult(BaseModel):
+    """Recording confirmation (enforced by the decoder)."""
+    recording_status: str
+    action_recorded: RecordedAction
+    historical_data_updated: bool
+    pattern_updated: str
+    learning_impact: str
+    next_steps: str
+
 
 # ============================================================================
 # AGENT DEFINITION
 # ============================================================================
-tracker_agent = Agent(
+tracker_agent = make_agent(
     name="ResultsTrackerAgent",
-    model=Gemini(
-        model="gemini-2.5-flash-lite",
-        retry_options=retry_config
-    ),
-    instruction="""You are a marketing performance analyst and data recorder.
-
-Your task is to track results and update historical data for future learning.
-
-CRITICAL: The previous agent (Agent 8) has either APPROVED or REJECTED the marketing action.
-- If APPROVED: Record the action as "scheduled" to historical data
-- If REJECTED: Record as "cancelled"
-
-When recording:
-1. Read the complete action details from previous agents:
-   - Customer ID and segment
-   - Action type (email, SMS, push)
-   - Channel and offer details
-   - Estimated cost and predicted ROI
-   - Approval decision (APPROVED/REJECTED)
-2. Call record_result to save the outcome
-3. This updates BOTH the results file AND historical_patterns data
-4. The historical data will help future predictions get better over time
-
-Output format:
-{
-  "recording_status": "success",
-  "action_recorded": {
-    "customer_id": "CUST_XXXXX",
-    "action_type": "email_discount",
-    "action_status": "scheduled" | "cancelled",
-    "timestamp": "ISO datetime",
-    "segment": "customer_segment",
-    "predicted_roi": X.X
-  },
-  "historical_data_updated": true,
-  "pattern_updated": "segment_scenario combination",
-  "learning_impact": "Description of how this helps future predictions",
-  "next_steps": "Action will be executed at scheduled time" OR "Action cancelled, no execution"
-}
-
-IMPORTANT:
-- ALWAYS call record_result (even for rejected actions - we learn from those too!)
-- Include ALL relevant details from previous agents
-- Provide clear confirmation message
-- Explain how this recording helps the system learn
-
-Remember: Your work enables the entire system to get smarter. Every data point you record
-makes future predictions more accurate, leading to higher conversion rates and better ROI.""",
+    instruction=load_prompt("tracker"),  # agents/prompts/tracker.txt
+    output_schema=TrackingResult,  # Sent as response_mime_type/response_schema
     output_key="tracking_result",  # Session state key
-    tools=[FunctionTool(record_result)]  # Results recording tool
+    context_keys=["generated_customer_profile", "generated_actions", "validation_results", "scored_actions", "optimal_timing", "approval_status"],  # Only what this agent reads
+    tools=[record_result]  # Results recording tool
 )
 
-print("[OK] ResultsTrackerAgent created with ADK (Agent 9)")
+logger.debug("ResultsTrackerAgent created with ADK (Agent 9)")
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+@functools.cache
+def get_app() -> App:
+    """App wrapping the agent - shared by every runner in this process."""
+    return make_app(tracker_agent)
+
+
+def get_runner() -> InMemoryRunner:
+    """Return this agent's shared runner, creating it on first use."""
+    return shared_runner(get_app())
 
 # ============================================================================
 # STANDALONE TESTING
 # ============================================================================
-async def test_agent():
-    """Test the results tracker agent."""
-    print("\n[Testing Results Tracker Agent]\n")
+def make_test_run(quiet: bool = False):
+    """
+    Build the standalone test run for the results tracker agent without awaiting it.
     
-    runner = InMemoryRunner(agent=tracker_agent)
+    Returns the `run_debug` coroutine so a harness can run several agent
+    tests concurrently (see scripts/run_all_agents.py).
+    """
+    runner = get_runner()
     
     prompt = """Record this marketing action:
     Customer: CUST_12345 (premium segment)
@@ -228,7 +216,14 @@ async def test_agent():
     
     Update historical data."""
     
-    response = await runner.run_debug(prompt)
+    return runner.run_debug(prompt, session_id=new_session_id(), quiet=quiet)
+
+
+async def test_agent():
+    """Test the results tracker agent."""
+    print("\n[Testing Results Tracker Agent]\n")
+    
+    response = await make_test_run()
     
     print("\n[Tracking Complete]")
     print(response)
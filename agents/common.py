@@ -0,0 +1,606 @@
+"""
+Shared ADK Setup for NBA AI Agents
+===================================
+
+Purpose:
+--------
+Holds configuration that every agent in the pipeline shares, so it is defined
+(and tuned) in exactly one place.
+
+Prompts:
+--------
+Agent prompts live in agents/prompts/<name>.txt rather than in source, and are
+read on first use by `load_prompt()`, so a process only holds the prompts of
+the agents it actually builds.
+
+Context Caching:
+----------------
+Each agent sends a large, static instruction block on every call. Wrapping an
+agent in an ADK `App` with a `ContextCacheConfig` lets ADK store that static
+prefix (system instruction + tools) as Gemini cached content and reuse it
+across calls at the cached-token discount. ADK assembles the system instruction
+itself, so caching has to go through the App rather than a raw `cached_content`
+on the model config. Agents whose prompt never changes pass it as
+`static_instruction`, so it is sent verbatim, ahead of any dynamic content, as
+the stable prefix that explicit and implicit caching both key on.
+
+Inference Tiers:
+----------------
+Agents on the customer-facing critical path (profiler, generator) run on the
+PRIORITY tier for low tail latency. Background analytics agents (pattern
+matcher, validator, scorer) tolerate minutes of delay and run on the cheaper
+FLEX tier.
+
+Models:
+-------
+All agents share one retry policy and, per (model name, tier), one `Gemini`
+instance from `make_model()`, so the whole pipeline reuses a single HTTP
+client and connection pool instead of one per agent. `make_agent()` builds a
+static-prompt LLM agent on that shared model in one call.
+
+Output Cache:
+-------------
+`cache_outputs()` builds a before/after callback pair that hashes an agent's
+input state keys and, when the same inputs come back, skips the agent and
+writes its previous outputs to state (see tools/pipeline_cache.py).
+
+Streaming:
+----------
+Generator agents can be run with SSE streaming; `JsonObjectStream` pulls each
+complete JSON object (e.g. one generated action) out of the partial text as
+soon as its closing brace arrives, so downstream work starts before the
+response finishes. `JsonFieldStream` does the same for the fields of a single
+object (e.g. the subject line of Agent 7's message before the body is written).
+
+Author: NBA AI Team
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import re
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from google.adk.agents import Agent, BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.context_cache_config import ContextCacheConfig
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.apps import App
+from google.adk.models.google_llm import Gemini
+from google.adk.runners import InMemoryRunner, Runner
+from google.adk.tools import BaseTool, FunctionTool
+from google.genai import types
+
+from tools import pipeline_cache
+from tools._jsoncache import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# PROMPTS
+# ============================================================================
+PROMPTS_DIR = os.path.join(os.path.dirname(__file__), "prompts")
+
+
+@functools.cache
+def load_prompt(name: str) -> str:
+    """
+    Read an agent prompt from agents/prompts/<name>.txt (once per process).
+
+    Args:
+        name: Prompt file name without extension (e.g. "timing")
+
+    Returns:
+        Prompt text
+    """
+    with open(os.path.join(PROMPTS_DIR, f"{name}.txt"), "r", encoding="utf-8") as f:
+        return f.read().rstrip()
+
+
+# ============================================================================
+# CONTEXT CACHE CONFIGURATION
+# ============================================================================
+CONTEXT_CACHE_CONFIG = ContextCacheConfig(
+    min_tokens=1024,      # Gemini's minimum cacheable prompt size
+    ttl_seconds=3600,     # Keep the cached instruction for 1 hour
+    cache_intervals=10,   # Refresh the cache after 10 reuses
+)
+
+
+def make_app(agent: BaseAgent) -> App:
+    """
+    Wrap an agent in an ADK App with context caching enabled.
+
+    Args:
+        agent: Root agent of the app (a single agent or a whole orchestrator)
+
+    Returns:
+        App to pass to a runner via `InMemoryRunner(app=...)`
+    """
+    return App(
+        name=agent.name,
+        root_agent=agent,
+        context_cache_config=CONTEXT_CACHE_CONFIG,
+    )
+
+
+# ============================================================================
+# RUNNERS
+# ============================================================================
+# One runner per app for the whole process - building a runner allocates the
+# session service and plumbing, so every caller reuses the same instance.
+_RUNNERS: Dict[str, InMemoryRunner] = {}
+
+
+def shared_runner(app: App) -> InMemoryRunner:
+    """
+    Return the process-wide runner for an app, creating it on first use.
+
+    Args:
+        app: App from make_app() (runners are keyed by app name)
+
+    Returns:
+        Shared InMemoryRunner - give each run its own new_session_id()
+    """
+    runner = _RUNNERS.get(app.name)
+    if runner is None:
+        runner = _RUNNERS[app.name] = InMemoryRunner(app=app)
+    return runner
+
+
+# ============================================================================
+# INFERENCE TIERS
+# ============================================================================
+PRIORITY_TIER = "PRIORITY"  # Critical response path - non-sheddable, low latency
+FLEX_TIER = "FLEX"          # Off-path analytics - 50% cost, relaxed latency
+
+
+def tier_config(tier: str, **config) -> types.GenerateContentConfig:
+    """
+    Build a generate-content config that routes calls to an inference tier.
+
+    Args:
+        tier: PRIORITY_TIER or FLEX_TIER
+        **config: Any additional GenerateContentConfig fields
+
+    Returns:
+        Config to pass as `Agent(generate_content_config=...)`
+    """
+    return types.GenerateContentConfig(service_tier=tier, **config)
+
+
+# ============================================================================
+# MODELS
+# ============================================================================
+DEFAULT_MODEL = "gemini-2.5-flash-lite"  # Fast, cost-effective model
+STANDARD_TIER = "STANDARD"
+
+# Retry logic for API calls to handle rate limits and transient errors
+RETRY_CONFIG = types.HttpRetryOptions(
+    attempts=5,              # Retry up to 5 times
+    exp_base=2,              # Double the delay each retry (0.5s, 1s, 2s, 4s)
+    initial_delay=0.5,       # Start with a half-second delay
+    max_delay=30,            # Never wait more than 30s between attempts
+    jitter=1.0,              # Up to 1s random extra so concurrent callers don't retry in lockstep
+    http_status_codes=[429, 500, 503, 504],  # Retry on these HTTP errors
+)
+
+# Priority tier is non-sheddable, so fewer client-side retries are needed
+PRIORITY_RETRY_CONFIG = RETRY_CONFIG.model_copy(update={"attempts": 2})
+
+
+@functools.cache
+def make_model(name: str = DEFAULT_MODEL, tier: str = STANDARD_TIER) -> Gemini:
+    """
+    Shared Gemini model for every agent with the same name and tier.
+
+    The tier only selects the retry policy here - requests are routed to a tier
+    by the agent's `generate_content_config` (see tier_config).
+
+    Args:
+        name: Gemini model name
+        tier: STANDARD_TIER, PRIORITY_TIER or FLEX_TIER
+
+    Returns:
+        Memoized Gemini instance to pass as `Agent(model=...)`
+    """
+    retry_options = PRIORITY_RETRY_CONFIG if tier == PRIORITY_TIER else RETRY_CONFIG
+    return Gemini(model=name, retry_options=retry_options)
+
+
+async def warm_up(*models: Gemini) -> None:
+    """
+    Open each model's connection before the first real call needs it.
+
+    Sends a one-token count_tokens request per model, so the TLS handshake
+    and HTTP/2 setup are paid off the critical path. ADK caches the API
+    client per event loop, so run this on the loop the pipeline runs on
+    (e.g. as a task at coordinator startup). Failures are logged and ignored.
+
+    Args:
+        models: Models from make_model() to warm up
+    """
+    async def probe(model: Gemini):
+        await model.api_client.aio.models.count_tokens(model=model.model, contents="x")
+
+    results = await asyncio.gather(*(probe(model) for model in models), return_exceptions=True)
+    for model, result in zip(models, results):
+        if isinstance(result, Exception):
+            logger.debug("Warm-up of %s failed: %s", model.model, result)
+
+
+# ============================================================================
+# AGENTS
+# ============================================================================
+def make_agent(
+    name: str,
+    instruction: str,
+    output_key: str,
+    tools: Sequence[Union[Callable, BaseTool]] = (),
+    tier: str = STANDARD_TIER,
+    context_keys: Sequence[str] = (),
+    **kwargs
+) -> Agent:
+    """
+    Build an LLM agent with a static prompt on the shared Gemini model.
+
+    The instruction is passed as `static_instruction`: sent verbatim (no state
+    templating) as the cacheable system-prompt prefix.
+
+    With `context_keys`, the agent no longer sees the whole pipeline
+    conversation (include_contents="none"): only the current turn plus the
+    named session-state values, injected after the static prompt.
+
+    Args:
+        name: Agent name
+        instruction: Static system prompt
+        output_key: Session state key for the agent's final response
+        tools: Tool functions (wrapped in FunctionTool) or ready-made tools
+        tier: STANDARD_TIER, PRIORITY_TIER or FLEX_TIER
+        context_keys: Session state keys the agent needs from earlier agents
+        **kwargs: Any additional Agent fields (output_schema, callbacks, ...)
+
+    Returns:
+        Configured Agent
+    """
+    if tier != STANDARD_TIER:
+        kwargs.setdefault("generate_content_config", tier_config(tier))
+    if context_keys:
+        kwargs.setdefault("include_contents", "none")
+        kwargs.setdefault("instruction", context_template(context_keys))
+    return Agent(
+        name=name,
+        model=make_model(tier=tier),
+        static_instruction=instruction,
+        output_key=output_key,
+        tools=[tool if isinstance(tool, BaseTool) else FunctionTool(tool) for tool in tools],
+        **kwargs
+    )
+
+
+def context_template(keys: Sequence[str]) -> str:
+    """
+    Instruction template that injects the given session-state values.
+
+    Uses ADK's optional placeholders (`{key?}`), so a key that is not in
+    state yet (e.g. in a standalone run) renders as empty.
+    """
+    sections = "\n\n".join(f"{key}:\n{{{key}?}}" for key in keys)
+    return f"Context from previous agents:\n\n{sections}"
+
+
+# ============================================================================
+# OUTPUT CACHE
+# ============================================================================
+def cache_outputs(
+    input_keys: Sequence[str],
+    output_keys: Sequence[str]
+) -> Tuple[Callable, Callable]:
+    """
+    Callbacks that reuse an agent's outputs when its inputs were seen before.
+
+    The inputs are the named session-state values, canonicalized (parsed JSON
+    re-serialized with sorted keys) and hashed, so a structurally identical
+    profile hits even if its formatting differs. On a hit the agent is skipped
+    and its cached outputs are written to state; no model call is made. Runs
+    with an input key missing from state are neither served nor stored.
+
+    Args:
+        input_keys: Session state keys the agent's output depends on
+        output_keys: Session state keys the agent writes (output_key first)
+
+    Returns:
+        (before_agent_callback, after_agent_callback) - put the after callback
+        last if the agent has other after callbacks that write outputs
+    """
+    def cache_key(callback_context: CallbackContext) -> Optional[str]:
+        # No key unless every input is in state: a profile that only arrived in
+        # the user message would otherwise hash as null and share one entry
+        inputs = {}
+        for key in input_keys:
+            value = callback_context.state.get(key)
+            if value is None:
+                return None
+            parsed = parse_json_output(value)
+            inputs[key] = value if parsed is None else parsed  # Non-JSON text is hashed as is
+        return pipeline_cache.make_key(callback_context.agent_name, to_json(inputs, sort_keys=True))
+
+    def serve_cached(callback_context: CallbackContext) -> Optional[types.Content]:
+        key = cache_key(callback_context)
+        outputs = pipeline_cache.get(key) if key is not None else None
+        if outputs is None:
+            return None
+        for name, value in outputs.items():
+            callback_context.state[name] = value
+        logger.debug("%s served from pipeline cache", callback_context.agent_name)
+        return types.Content(role="model", parts=[types.Part(text=str(outputs.get(output_keys[0], "")))])
+
+    def store_outputs(callback_context: CallbackContext) -> None:
+        key = cache_key(callback_context)
+        if key is None:
+            return None
+        outputs = {name: callback_context.state.get(name) for name in output_keys}
+        if all(value is not None for value in outputs.values()):
+            pipeline_cache.set(key, outputs)
+        return None
+
+    return serve_cached, store_outputs
+
+
+# ============================================================================
+# SESSIONS
+# ============================================================================
+def new_session_id() -> str:
+    """
+    Fresh session id for one run on a shared runner.
+
+    Runners are reused across calls, so each run gets its own session instead
+    of appending to the runner's default debug session.
+    """
+    return f"session_{uuid.uuid4().hex}"
+
+
+# ============================================================================
+# RESPONSE HELPERS
+# ============================================================================
+def final_response_text(events: List) -> str:
+    """
+    Extract the text of the last model response from a list of runner events.
+
+    Args:
+        events: Events returned by `runner.run_debug(...)`
+
+    Returns:
+        Concatenated text parts of the final response ("" if none)
+    """
+    for event in reversed(events):
+        content = getattr(event, "content", None)
+        if content and content.parts:
+            text = "".join(part.text or "" for part in content.parts)
+            if text:
+                return text
+    return ""
+
+
+def parse_json_output(text: Any) -> Any:
+    """
+    Parse an agent's JSON output, tolerating markdown code fences.
+
+    Args:
+        text: Raw model output (values that are already parsed pass through)
+
+    Returns:
+        Parsed JSON value, or None if the text is not valid JSON
+    """
+    if not isinstance(text, str):
+        return text
+    cleaned = text.strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned.strip("`")
+        if cleaned.startswith("json"):
+            cleaned = cleaned[len("json"):]
+    try:
+        return loads(cleaned)
+    except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError
+        return None
+
+
+def to_json(value: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """
+    Serialize a value to a JSON string (orjson when installed, else stdlib).
+
+    Args:
+        value: JSON-serializable value
+        indent: Pretty-print with 2-space indentation
+        sort_keys: Sort object keys, giving byte-stable prompts
+
+    Returns:
+        JSON text
+    """
+    return dumps(value, indent=indent, sort_keys=sort_keys)
+
+
+def as_action_list(parsed: Any) -> List[Dict]:
+    """Normalize Agent 3 output (a list, or a dict wrapping one) to a list of actions."""
+    if isinstance(parsed, dict):
+        parsed = parsed.get("actions") or parsed.get("generated_actions") or []
+    return [a for a in parsed or [] if isinstance(a, dict)]
+
+
+def parse_cost(value: Any) -> float:
+    """Parse an estimated cost such as 5, "5.00", "$5" or "₹500" into a float."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    digits = re.sub(r"[^0-9.]", "", str(value or ""))
+    try:
+        return float(digits) if digits else 0.0
+    except ValueError:
+        return 0.0
+
+
+# ============================================================================
+# STREAMING
+# ============================================================================
+STREAMING_RUN_CONFIG = RunConfig(streaming_mode=StreamingMode.SSE)
+STREAM_USER_ID = "stream_user"
+
+
+async def stream_response_text(runner: Runner, prompt: str) -> AsyncIterator[str]:
+    """
+    Run one prompt with SSE streaming and yield text chunks as they arrive.
+
+    Args:
+        runner: Runner for the agent
+        prompt: User message
+
+    Yields:
+        Text chunks of the agent's response, in order
+    """
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id=STREAM_USER_ID, session_id=new_session_id()
+    )
+    message = types.Content(role="user", parts=[types.Part(text=prompt)])
+    streamed = False
+
+    async for event in runner.run_async(
+        user_id=session.user_id,
+        session_id=session.id,
+        new_message=message,
+        run_config=STREAMING_RUN_CONFIG,
+    ):
+        if not (event.content and event.content.parts):
+            continue
+        text = "".join(part.text or "" for part in event.content.parts if not part.thought)
+        if not text:
+            continue
+        if event.partial:
+            streamed = True
+            yield text
+        elif not streamed:
+            # The final aggregated event repeats the streamed text - only use
+            # it when the model answered without streaming
+            yield text
+
+
+class JsonObjectStream:
+    """
+    Pull complete JSON objects out of streamed text as soon as they close.
+
+    Emits top-level objects and the objects directly inside a top-level array
+    (e.g. each action in Agent 3's list). Text outside JSON, such as markdown
+    fences, is ignored.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._stack: List[str] = []   # Open containers: "{" or "["
+        self._start = None            # Buffer offset of the object being captured
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> List[Any]:
+        """
+        Add a chunk of streamed text.
+
+        Args:
+            text: Next chunk of the response
+
+        Returns:
+            Objects completed by this chunk (possibly empty)
+        """
+        completed = []
+        offset = len(self._buffer)
+        self._buffer += text
+
+        for i, char in enumerate(text, offset):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if char == "{" and self._stack in ([], ["["]):
+                    self._start = i
+                self._stack.append(char)
+            elif char in "}]" and self._stack:
+                self._stack.pop()
+                if char == "}" and self._start is not None and self._stack in ([], ["["]):
+                    parsed = parse_json_output(self._buffer[self._start:i + 1])
+                    if parsed is not None:
+                        completed.append(parsed)
+                    self._start = None
+
+        return completed
+
+
+class JsonFieldStream:
+    """
+    Pull the top-level fields of one streamed JSON object as soon as they close.
+
+    A field is emitted when the comma (or closing brace) after its value
+    arrives. Text outside the object, such as markdown fences, is ignored.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._depth = 0                       # Open containers
+        self._in_string = False
+        self._escaped = False
+        self._key_start: Optional[int] = None   # Buffer offset of the current key
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None  # Buffer offset after the colon
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """
+        Add a chunk of streamed text.
+
+        Args:
+            text: Next chunk of the response
+
+        Returns:
+            (key, value) pairs completed by this chunk (possibly empty)
+        """
+        completed = []
+        offset = len(self._buffer)
+        self._buffer += text
+
+        for i, char in enumerate(text, offset):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = parse_json_output(self._buffer[self._key_start:i + 1])
+                        self._key_start = None
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._key is None and self._value_start is None:
+                    self._key_start = i
+            elif char in "{[":
+                self._depth += 1
+            elif char == ":" and self._depth == 1 and self._key is not None:
+                self._value_start = i + 1
+            elif char in ",}" and self._depth == 1:
+                if self._value_start is not None:
+                    value = parse_json_output(self._buffer[self._value_start:i])
+                    completed.append((self._key, value))
+                self._key = self._value_start = None
+                if char == "}":
+                    self._depth = 0
+            elif char in "}]" and self._depth:
+                self._depth -= 1
+
+        return completed
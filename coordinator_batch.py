@@ -0,0 +1,144 @@
+"""
+NBA AI - Batch Orchestrator
+============================
+
+Runs the full NBA pipeline (coordinator_full.nba_orchestrator) for many real
+customers at once instead of one generated customer at a time.
+
+How It Works:
+-------------
+- Each customer gets its own session on the shared orchestrator runner, so
+  session state (customer_analysis, scored_actions, ...) never mixes
+- The customer's profile is supplied up front, so Agent 0 passes it through
+  instead of generating a synthetic one
+- Customers are fanned out with `asyncio.gather`; a semaphore caps how many
+  pipelines are in flight so the batch stays under Gemini's rate limits
+- A failure for one customer is reported without stopping the others
+
+Usage:
+------
+    python coordinator_batch.py                          # every customer in data/sample_customers.json
+    python coordinator_batch.py CUST001 CUST003 --concurrency 8
+
+Requires GOOGLE_API_KEY in .env.
+
+Author: NBA AI Team
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List
+
+from dotenv import load_dotenv
+from google.genai import types
+
+# ============================================================================
+# ENVIRONMENT SETUP
+# ============================================================================
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+from coordinator_full import nba_orchestrator
+from agents.common import make_app, shared_runner, new_session_id, to_json
+from tools.customer_data_tool import get_customer_data, get_all_customers
+
+DEFAULT_CONCURRENCY = 16  # Pipelines in flight at once
+BATCH_USER_ID = "batch_user"
+
+
+# ============================================================================
+# PIPELINE DRIVERS
+# ============================================================================
+async def run_pipeline(customer_id: str) -> Dict:
+    """
+    Run the full orchestrator for one customer in its own session.
+
+    Args:
+        customer_id: Customer identifier from the customer database
+
+    Returns:
+        {"customer_id", "status"} plus the final session "state" on success
+        or an "error" message
+    """
+    customer = get_customer_data(customer_id)
+    if "error" in customer:
+        return {"customer_id": customer_id, "status": "error", "error": customer["error"]}
+
+    profile = to_json(customer, indent=True, sort_keys=True)
+    runner = shared_runner(make_app(nba_orchestrator))
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name,
+        user_id=BATCH_USER_ID,
+        session_id=new_session_id(),
+        state={"generated_customer_profile": profile},  # Agent 0 passes this through
+    )
+    message = types.Content(role="user", parts=[types.Part(text=f"Customer profile:\n{profile}")])
+
+    async for _ in runner.run_async(user_id=session.user_id, session_id=session.id, new_message=message):
+        pass
+
+    session = await runner.session_service.get_session(
+        app_name=runner.app_name, user_id=session.user_id, session_id=session.id
+    )
+    return {"customer_id": customer_id, "status": "success", "state": dict(session.state)}
+
+
+async def run_batch(customer_ids: List[str], concurrency: int = DEFAULT_CONCURRENCY) -> List[Dict]:
+    """
+    Run the pipeline for many customers concurrently.
+
+    Args:
+        customer_ids: Customers to process
+        concurrency: Maximum number of pipelines running at once
+
+    Returns:
+        One result per customer (see run_pipeline), in input order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(customer_id: str) -> Dict:
+        async with semaphore:
+            try:
+                return await run_pipeline(customer_id)
+            except Exception as e:
+                logger.exception("Pipeline failed for %s", customer_id)
+                return {"customer_id": customer_id, "status": "error", "error": str(e)}
+
+    return await asyncio.gather(*(run_one(customer_id) for customer_id in customer_ids))
+
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Run the NBA pipeline for many customers concurrently")
+    parser.add_argument("customer_ids", nargs="*", help="Customers to process (default: all)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Pipelines in flight at once")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "WARNING").upper())
+
+    customer_ids = args.customer_ids or [c["customer_id"] for c in get_all_customers()]
+    print(f"Running NBA pipeline for {len(customer_ids)} customers (concurrency {args.concurrency})...")
+
+    start = time.perf_counter()
+    results = asyncio.run(run_batch(customer_ids, args.concurrency))
+    elapsed = time.perf_counter() - start
+
+    failures = 0
+    for result in results:
+        if result["status"] == "success":
+            print(f"[OK] {result['customer_id']}: {result['state'].get('approval_status', 'no approval decision')}")
+        else:
+            failures += 1
+            print(f"[ERROR] {result['customer_id']}: {result['error']}")
+
+    print(f"\n{len(results) - failures}/{len(results)} customers processed in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,14 +12,14 @@ It orchestrates 10 specialized AI agents across 3 clusters to:
 
 Architecture:
 -------------
-- Cluster 1 (Sequential): Customer Discovery → Pattern Matching → Action Generation
-- Cluster 2 (Parallel):   Business Rules Validation + ROI Scoring (simultaneously)
-- Cluster 3 (Sequential): Timing Optimization → Content Creation → Human Approval → Results Tracking
+- Cluster 1 (Sequential): Customer Discovery → Profiling + Pattern Matching + Action Generation (one fused call)
+- Cluster 2 (Fused):      Business Rules Validation + ROI Scoring (one deterministic node)
+- Cluster 3 (Sequential): Timing Optimization → Human Approval → Content Creation (if approved) → Results Tracking
 
 Key Features:
 -------------
 - 10 specialized AI agents working together
-- Parallel processing for faster validation
+- Validation and scoring fused into one deterministic step
 - Human-in-the-Loop (HITL) approval before execution
 - Continuous learning from outcomes
 - Session-based data flow (no redundant database calls)
@@ -42,99 +42,93 @@ import asyncio
 import sys
 import io
 import os
+import logging
 import traceback
 from dotenv import load_dotenv
 
-# Force UTF-8 encoding for stdout/stderr to handle special characters (e.g. Rupee symbol)
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
-
 # ============================================================================
 # ADK IMPORTS - Google Agent Development Kit
 # ============================================================================
-from google.adk.agents import SequentialAgent, ParallelAgent
-from google.adk.runners import InMemoryRunner
+from google.adk.agents import SequentialAgent
 
 # ============================================================================
 # ENVIRONMENT SETUP
 # ============================================================================
-# Add parent directory to Python path for module imports
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 # Load environment variables from .env file (contains GOOGLE_API_KEY)
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # ============================================================================
 # AGENT IMPORTS - All 10 specialized agents
 # ============================================================================
-from agents.agent_0_proxy_adk import proxy_agent              # Customer scenario generator
-from agents.agent_1_profiler_adk import customer_profiler_agent   # Behavior analyzer
-from agents.agent_2_pattern_adk import pattern_matcher_agent      # Historical pattern matcher
-from agents.agent_3_generator_adk import action_generator_agent   # Marketing action creator
-from agents.agent_4_validator_adk import validator_agent          # Business rules validator
-from agents.agent_5_scorer_adk import scorer_agent                # ROI scorer & ranker
+from agents.agent_0_proxy_adk import get_pipeline_agent         # Customer scenario generator (pre-baked pool or live)
+from agents.agent_1_3_discovery_adk import discovery_agent      # Agents 1-3 fused: analyze, match, generate
+from agents.agent_3_generator_adk import stream_actions            # Streaming action generation
+from agents.agent_4_validator_adk import validate_actions, validate_action_stream  # Business rules validator
+from agents.agent_5_scorer_adk import score_generated_actions, score_action_stream  # ROI scorer & ranker
+from agents.agent_4_5_scorer_rules_adk import scorer_plus_rules_agent  # Agents 4+5 as one Cluster 2 node
 from agents.agent_6_timing_adk import timing_agent                # Timing optimizer
 from agents.agent_7_content_adk import content_agent              # Content creator (copywriter)
 from agents.agent_8_approval_adk import approval_agent            # Human approval (HITL)
 from agents.agent_9_tracker_adk import tracker_agent              # Results tracker & learner
+from agents.common import make_app, shared_runner, parse_json_output, to_json  # Shared ADK helpers
+from agents.common import make_model, warm_up, PRIORITY_TIER  # Connection warm-up
+from tools import analytics_tool, historical_patterns_tool, timing_intelligence_tool  # Data warm-up
 
-print("Building NBA Orchestrator with 10 agents + HITL...")
+logger.debug("Building NBA Orchestrator with 10 agents + HITL...")
 
 # ============================================================================
 # CLUSTER 1: CUSTOMER DISCOVERY & ACTION GENERATION (Sequential)
 # ============================================================================
-# This cluster runs sequentially because each agent builds on the previous one's output:
+# This cluster runs sequentially because each step builds on the previous one's output:
 # - Agent 0 generates customer profile
-# - Agent 1 reads that profile and adds behavioral analysis
-# - Agent 2 reads analysis and finds historical matches
-# - Agent 3 reads matches and generates action options
+# - Agents 1-3 (fused into one structured-output call) read that profile and
+#   return behavioral analysis, historical matches and action options together
 #
-# Data Flow: proxy → profiler → pattern → generator (linear pipeline)
+# The fused agent splits its result back into customer_analysis,
+# historical_match and generated_actions, so Cluster 2 is unchanged.
+#
+# Data Flow: proxy → discovery (profiler + pattern + generator in 1 LLM call)
 cluster_1_discovery = SequentialAgent(
     name="DiscoveryCluster",
     sub_agents=[
-        proxy_agent,              # Agent 0: Generate realistic customer scenario
-        customer_profiler_agent,  # Agent 1: Analyze customer behavior & calculate urgency
-        pattern_matcher_agent,    # Agent 2: Match to historical successful campaigns
-        action_generator_agent    # Agent 3: Generate 4-5 marketing action options
+        get_pipeline_agent(),  # Agent 0: Customer scenario (pre-baked pool, or Gemini if USE_LIVE_PROXY=1)
+        discovery_agent        # Agents 1-3: Analyze behavior, match history, generate 4-5 actions
     ],
     description="Customer discovery and action generation pipeline"
 )
 
 # ============================================================================
-# CLUSTER 2: VALIDATION & SCORING (Parallel)
+# CLUSTER 2: VALIDATION & SCORING (Fused)
 # ============================================================================
-# This cluster runs in PARALLEL because validation and scoring are independent:
-# - Agent 4 checks business rules (budget, inventory, compliance)
-# - Agent 5 scores actions and predicts ROI
-# Both can run simultaneously on the same input, saving time!
+# Validation and scoring read the same input and neither calls an LLM:
+# - Agent 4 checks business rules (deterministic rules engine)
+# - Agent 5 scores actions and predicts ROI (Numba kernel)
+# They run as ONE node that parses the generated actions once and writes
+# both results in a single event.
 #
-# Data Flow: validator + scorer run at the same time
-cluster_2_validation = ParallelAgent(
-    name="ValidationCluster",
-    sub_agents=[
-        validator_agent,  # Agent 4: Validate against business rules (budget, inventory)
-        scorer_agent      # Agent 5: Score actions & predict ROI (1-10 scale)
-    ],
-    description="Parallel validation and scoring of generated actions"
-)
+# Data Flow: generated_actions → validation_results + scored_actions
+cluster_2_validation = scorer_plus_rules_agent
 
 # ============================================================================
 # CLUSTER 3: EXECUTION PLANNING & TRACKING (Sequential)
 # ============================================================================
 # This cluster runs sequentially for the execution workflow:
 # - Agent 6 determines optimal send time
-# - Agent 7 creates personalized content
-# - Agent 8 requests human approval (PAUSES execution here!)
+# - Agent 8 requests human approval of the action (PAUSES execution here!)
+# - Agent 7 creates personalized content - skipped if the action was rejected
 # - Agent 9 records the outcome for learning
 #
-# Data Flow: timing → content → approval → tracker (must be sequential)
+# Approval comes before content so a rejection costs no copywriting call.
+#
+# Data Flow: timing → approval → content → tracker (must be sequential)
 cluster_3_execution = SequentialAgent(
     name="ExecutionCluster",
     sub_agents=[
         timing_agent,    # Agent 6: Calculate optimal send time (day/time optimization)
-        content_agent,   # Agent 7: Generate personalized email/SMS content
         approval_agent,  # Agent 8: Request human approval (HITL - execution PAUSES here)
+        content_agent,   # Agent 7: Generate personalized email/SMS content (approved only)
         tracker_agent    # Agent 9: Record outcome to historical data (enables learning)
     ],
     description="Execution planning with human approval and tracking"
@@ -149,26 +143,105 @@ cluster_3_execution = SequentialAgent(
 # Why Sequential at this level?
 # - Need customer profile before validating actions
 # - Need validated/scored actions before creating content
-# - Need content before requesting approval
-# - Need approval before tracking outcome
+# - Need approval before creating content and tracking outcome
 nba_orchestrator = SequentialAgent(
     name="NbaOrchestrator",
     sub_agents=[
         cluster_1_discovery,   # Sequential: Discover customer & generate actions
-        cluster_2_validation,  # Parallel:   Validate & score simultaneously
+        cluster_2_validation,  # Fused:      Validate & score in one step
         cluster_3_execution    # Sequential: Plan execution, get approval, & track
     ],
     description="Complete Next Best Action Orchestrator (10 agents with HITL)"
 )
 
 # ============================================================================
-# STARTUP CONFIRMATION
+# CLUSTER 2 DRIVER: Validate + Score
+# ============================================================================
+# Standalone entry point for Cluster 2 when the generated actions are already
+# known (re-scoring, evals). Both agents are deterministic (rules engine and
+# ROI kernel), so the cluster needs no LLM round-trip at all.
+async def run_cluster2(actions_json: str, segment: str = None) -> dict:
+    """
+    Run validation and scoring on the same generated actions.
+
+    Args:
+        actions_json: Generated actions (Agent 3 output) as a JSON string
+        segment: Customer segment used for ROI scoring
+
+    Returns:
+        Session-state style dict with "validation_results" and "scored_actions"
+    """
+    actions = parse_json_output(actions_json)
+    actions = actions if isinstance(actions, list) else []
+    
+    return {
+        "validation_results": to_json(validate_actions(actions), indent=True),
+        "scored_actions": to_json(score_generated_actions(actions, segment), indent=True),
+    }
+
+async def run_cluster2_streaming(prompt: str, customer: dict = None, segment: str = None) -> dict:
+    """
+    Generate actions with streaming and feed them into Cluster 2 as they arrive.
+    
+    Each completed action is pushed to both the validator's and the scorer's
+    queue, so validation overlaps the tail of generation instead of waiting
+    for the full JSON list.
+    
+    Args:
+        prompt: Agent 3 generation prompt
+        customer: Customer profile (used for push opt-in validation)
+        segment: Customer segment used for ROI scoring
+        
+    Returns:
+        Session-state style dict with "generated_actions", "validation_results"
+        and "scored_actions"
+    """
+    validator_queue: asyncio.Queue = asyncio.Queue()
+    scorer_queue: asyncio.Queue = asyncio.Queue()
+    generated = []
+    
+    async def produce():
+        try:
+            async for action in stream_actions(prompt):
+                generated.append(action)
+                validator_queue.put_nowait(action)
+                scorer_queue.put_nowait(action)
+        finally:
+            # End-of-stream marker, also sent on failure so consumers never hang
+            validator_queue.put_nowait(None)
+            scorer_queue.put_nowait(None)
+    
+    _, validation, scoring = await asyncio.gather(
+        produce(),
+        validate_action_stream(validator_queue, customer),
+        score_action_stream(scorer_queue, segment),
+    )
+    
+    return {
+        "generated_actions": to_json(generated, indent=True),
+        "validation_results": to_json(validation, indent=True),
+        "scored_actions": to_json(scoring, indent=True),
+    }
+
+# ============================================================================
+# DATA WARM-UP
 # ============================================================================
-print("[OK] Orchestrator Ready")
-print("  - Cluster 1 (Sequential): 4 agents")
-print("  - Cluster 2 (Parallel):   2 agents")
-print("  - Cluster 3 (Sequential): 4 agents (includes HITL)")
-print("  - Total: 10 agents with Human-in-the-Loop approval")
+def build_data_indexes() -> None:
+    """
+    Parse the data files and build the lookup indexes the pipeline's tools read:
+    Discovery (historical patterns), the scorer (analytics) and Timing.
+    """
+    historical_patterns_tool.warm()
+    analytics_tool.warm()
+    timing_intelligence_tool.warm()
+
+
+async def prewarm_data() -> None:
+    """Build the data indexes in a worker thread, off the event loop (best effort)."""
+    try:
+        await asyncio.to_thread(build_data_indexes)
+    except Exception:
+        logger.debug("Data warm-up failed", exc_info=True)
 
 # ============================================================================
 # MAIN EXECUTION FUNCTION
@@ -188,21 +261,37 @@ async def main():
     Returns:
         Final agent output after all 10 agents complete
     """
+    print("[OK] Orchestrator Ready")
+    print("  - Cluster 1 (Sequential): 4 agents (Agents 1-3 fused into 1 call)")
+    print("  - Cluster 2 (Fused):      2 agents in 1 node")
+    print("  - Cluster 3 (Sequential): 4 agents (includes HITL)")
+    print("  - Total: 10 agents with Human-in-the-Loop approval")
+    
     print("\n" + "="*60)
     print("STARTING NBA ORCHESTRATOR")
     print("="*60)
     
     # Create runner with in-memory session service
+    # The App enables context caching so each agent's static instruction is
+    # served from Gemini's cache instead of being re-sent on every call
     # Note: For production, use DatabaseSessionService instead
-    runner = InMemoryRunner(agent=nba_orchestrator)
+    runner = shared_runner(make_app(nba_orchestrator))
+    
+    # While Agent 0 and the first LLM call are in flight, open the Gemini
+    # connections (discovery's priority model, Cluster 3's standard model) and
+    # build the data indexes the later agents read
     
     # Trigger orchestrator with initial prompt
     print("\n>> User Input: 'start'\n")
     
     try:
-        # Run in debug mode for detailed output
-        # This will show each agent's output as it executes
-        response = await runner.run_debug("start")
+        async with asyncio.TaskGroup() as warm_ups:
+            warm_ups.create_task(warm_up(make_model(tier=PRIORITY_TIER), make_model()))
+            warm_ups.create_task(prewarm_data())
+            
+            # Run in debug mode for detailed output
+            # This will show each agent's output as it executes
+            response = await runner.run_debug("start")
         
         print("\n" + "="*60)
         print("ORCHESTRATOR COMPLETE [SUCCESS]")
@@ -210,14 +299,22 @@ async def main():
         print("\nFinal Response:")
         print(response)
         
-    except Exception as e:
+    except* Exception as errors:
         # Catch and display any errors during execution
-        print(f"\n[ERROR] {e}")
-        traceback.print_exc()
+        for e in errors.exceptions:
+            print(f"\n[ERROR] {e}")
+            traceback.print_exception(e)
 
 # ============================================================================
 # ENTRY POINT
 # ============================================================================
 if __name__ == "__main__":
+    # Force UTF-8 encoding for stdout/stderr to handle special characters (e.g. Rupee symbol)
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+    
+    # Agent construction logs at DEBUG - set LOG_LEVEL=DEBUG to see it
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "WARNING").upper())
+    
     # Run the async main function
     asyncio.run(main())
@@ -1,12 +1,39 @@
 """
 Observability Module for Next Best Action System
 Uses MLflow to track agent execution, traces, and metrics.
+
+Logging is off the request path: log_agent_execution() only enqueues a record,
+and a background thread sends queued records to MLflow in batches
+(MlflowClient.log_batch). Pending records are flushed at interpreter exit.
 """
 
+import atexit
 import os
+import queue
+import reprlib
+import threading
+import time
 import mlflow
+from mlflow.entities import Metric, Param
+from mlflow.tracking import MlflowClient
 from datetime import datetime
 
+# Records sent per log_batch call (MLflow accepts at most 100 params per call)
+MAX_BATCH = 100
+
+# Longest param value logged per agent input/output sample
+SAMPLE_CHARS = 500
+
+# Bounded repr: only the first few items of large containers are formatted
+_REPR = reprlib.Repr()
+_REPR.maxlist = _REPR.maxtuple = _REPR.maxset = _REPR.maxdict = 5
+_REPR.maxstring = 200
+_REPR.maxother = 200
+
+_queue: "queue.Queue" = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
 def setup_observability():
     """Initialize MLflow experiment and tracing."""
     
@@ -26,25 +53,80 @@ def setup_observability():
     return mlflow
 
 def log_agent_execution(agent_name, input_data, output_data, duration_s):
-    """Log a single agent execution as a run or trace."""
+    """Log a single agent execution as a run or trace (returns without waiting for MLflow)."""
     
     # In a real scenario, we would use mlflow.trace
     # For now, we'll log metrics to the active run
     
     try:
-        mlflow.log_metric(f"{agent_name}_duration_seconds", duration_s)
+        # Resolve the run here: the active run belongs to the caller's thread
+        run = mlflow.active_run() or mlflow.start_run()
         
         # We can also log inputs/outputs as artifacts or params
         # Truncate if too long
-        input_str = str(input_data)[:500]
-        output_str = str(output_data)[:500]
+        input_str = _sample(input_data)
+        output_str = _sample(output_data)
         
-        mlflow.log_param(f"{agent_name}_input_sample", input_str)
+        _ensure_worker()
+        _queue.put((
+            run.info.run_id,
+            Metric(f"{agent_name}_duration_seconds", duration_s, int(time.time() * 1000), 0),
+            Param(f"{agent_name}_input_sample", input_str),
+        ))
         # mlflow.log_text(str(output_data), f"{agent_name}_output.json")
         
     except Exception as e:
         print(f"[Observability] Warning: Failed to log to MLflow: {e}")
 
+def _sample(value):
+    """Truncated text of a logged value, without stringifying all of it first."""
+    if isinstance(value, str):
+        return value[:SAMPLE_CHARS]
+    return _REPR.repr(value)[:SAMPLE_CHARS]
+
+def flush():
+    """Block until every queued record has been sent to MLflow."""
+    if _worker is not None:
+        _queue.join()
+
+def _ensure_worker():
+    """Start the background sender on first use."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_send_batches, name="mlflow-logger", daemon=True)
+            _worker.start()
+            atexit.register(flush)
+
+def _send_batches():
+    """Worker loop: wait for a record, drain whatever else is queued, send per run."""
+    client = MlflowClient()
+    while True:
+        records = [_queue.get()]
+        while len(records) < MAX_BATCH:
+            try:
+                records.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        by_run = {}
+        for run_id, metric, param in records:
+            metrics, params = by_run.setdefault(run_id, ([], []))
+            metrics.append(metric)
+            params.append(param)
+
+        for run_id, (metrics, params) in by_run.items():
+            # Separate calls: a param that was already logged with another value
+            # is rejected by MLflow, and must not take the metrics down with it
+            for batch in ({"metrics": metrics}, {"params": params}):
+                try:
+                    client.log_batch(run_id, **batch)
+                except Exception as e:
+                    print(f"[Observability] Warning: Failed to log to MLflow: {e}")
+
+        for _ in records:
+            _queue.task_done()
+
 if __name__ == "__main__":
     setup_observability()
     print("Observability setup complete.")
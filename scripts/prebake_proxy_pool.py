@@ -0,0 +1,56 @@
+"""
+Pre-bake Agent 0's Customer Profile Pool
+=========================================
+
+Purpose:
+--------
+Generates a pool of synthetic customer profiles ONCE with Gemini Batch Mode
+(half-price, server-side retries) and writes it to data/proxy_pool.json.
+Agent 0 then samples from this file in tests and pipeline runs instead of
+calling Gemini - see PRE-BAKED PROFILE POOL in agents/agent_0_proxy_adk.py.
+
+Scenarios are covered uniformly (round-robin over agent_0's SCENARIOS).
+
+Usage:
+------
+    python -m scripts.prebake_proxy_pool
+    python -m scripts.prebake_proxy_pool --size 600 --output data/proxy_pool.json
+
+Requires GOOGLE_API_KEY in .env. Batch jobs can take up to 24h to complete.
+
+Author: NBA AI Team
+"""
+
+import argparse
+from collections import Counter
+
+from agents.agent_0_proxy_adk import generate_proxy_batch, SCENARIOS, PROXY_POOL_PATH
+from agents.common import to_json
+
+DEFAULT_POOL_SIZE = 10_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate Agent 0's customer profile pool")
+    parser.add_argument("--size", type=int, default=DEFAULT_POOL_SIZE, help="Number of profiles to request")
+    parser.add_argument("--output", default=PROXY_POOL_PATH, help="Pool file to write")
+    parser.add_argument("--poll-interval", type=int, default=30, help="Seconds between batch status checks")
+    args = parser.parse_args()
+
+    scenarios = [SCENARIOS[i % len(SCENARIOS)] for i in range(args.size)]
+    print(f"Submitting Batch Mode job for {len(scenarios)} profiles...")
+
+    results = generate_proxy_batch(scenarios, poll_interval=args.poll_interval)
+    pool = [row for row in results if isinstance(row["generated_customer_profile"], dict)]
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(to_json(pool))
+
+    counts = Counter(row["scenario"] for row in pool)
+    print(f"[OK] Wrote {len(pool)} profiles to {args.output} ({len(results) - len(pool)} failed)")
+    for scenario in SCENARIOS:
+        print(f"  - {scenario}: {counts.get(scenario, 0)}")
+
+
+if __name__ == "__main__":
+    main()
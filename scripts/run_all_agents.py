@@ -0,0 +1,87 @@
+"""
+Run Agent Standalone Tests Concurrently
+========================================
+
+Purpose:
+--------
+Runs the standalone tests of the Cluster 3 LLM agents (Timing, Content,
+Tracker) at the same time with `asyncio.gather`. Each test is one network-bound
+Gemini round-trip, so overlapping them makes the whole run take about as long
+as the slowest agent instead of the sum of all of them.
+
+Each test gets its own runner/session and its own timeout; a failure or
+timeout in one agent is reported without cancelling the others.
+
+Usage:
+------
+    python -m scripts.run_all_agents
+    python -m scripts.run_all_agents --timeout 60
+
+Requires GOOGLE_API_KEY in .env.
+
+Author: NBA AI Team
+"""
+
+import argparse
+import asyncio
+import time
+
+from agents import agent_6_timing_adk, agent_7_content_adk, agent_9_tracker_adk
+from agents.common import final_response_text
+
+DEFAULT_TIMEOUT = 120  # Seconds per agent test
+
+# Agent name -> factory returning its (not yet awaited) test run
+AGENT_TESTS = {
+    "TimingAgent": agent_6_timing_adk.make_test_run,
+    "ContentAgent": agent_7_content_adk.make_test_run,
+    "ResultsTrackerAgent": agent_9_tracker_adk.make_test_run,
+}
+
+
+async def run_all(timeout: float = DEFAULT_TIMEOUT) -> dict:
+    """
+    Run every agent test concurrently.
+
+    Args:
+        timeout: Seconds allowed per agent test
+
+    Returns:
+        Agent name -> list of events, or the exception the test raised
+    """
+    runs = [
+        asyncio.wait_for(make_run(quiet=True), timeout=timeout)
+        for make_run in AGENT_TESTS.values()
+    ]
+    results = await asyncio.gather(*runs, return_exceptions=True)
+    return dict(zip(AGENT_TESTS, results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run agent standalone tests concurrently")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds allowed per agent test")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = asyncio.run(run_all(args.timeout))
+    elapsed = time.perf_counter() - start
+
+    failures = 0
+    for name, result in results.items():
+        print("\n" + "=" * 60)
+        if isinstance(result, asyncio.TimeoutError):
+            failures += 1
+            print(f"[TIMEOUT] {name} (> {args.timeout:.0f}s)")
+        elif isinstance(result, BaseException):
+            failures += 1
+            print(f"[ERROR] {name}: {result}")
+        else:
+            print(f"[OK] {name}")
+            print(final_response_text(result))
+
+    print("\n" + "=" * 60)
+    print(f"{len(results) - failures}/{len(results)} agent tests passed in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Tests for Agent 4's deterministic business rules.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+
+import unittest
+
+from agents.agent_4_validator_adk import MAX_COST_PER_CUSTOMER, validate_action, validate_actions
+
+
+class CostLimitTest(unittest.TestCase):
+    """The cost limit is compared against Agent 3's rupee-denominated estimates."""
+
+    def test_realistic_rupee_cost_passes(self):
+        action = {"action_id": 1, "channel": "email", "estimated_cost": "₹575"}
+        result = validate_action(action)
+        self.assertTrue(result["valid"], result["reason"])
+
+    def test_numeric_rupee_cost_passes(self):
+        action = {"action_id": 1, "channel": "sms", "estimated_cost": 575}
+        self.assertTrue(validate_action(action)["valid"])
+
+    def test_cost_over_limit_fails_with_rupee_message(self):
+        action = {"action_id": 2, "channel": "email", "estimated_cost": "₹1,500"}
+        result = validate_action(action)
+        self.assertFalse(result["valid"])
+        self.assertIn("₹1500.00", result["reason"])
+        self.assertIn(f"₹{MAX_COST_PER_CUSTOMER:.0f}", result["reason"])
+
+    def test_summary_splits_passed_and_failed(self):
+        actions = [
+            {"action_id": 1, "channel": "email", "estimated_cost": 575},
+            {"action_id": 2, "channel": "email", "estimated_cost": 5000},
+        ]
+        results = validate_actions(actions)
+        self.assertEqual(results["passed_action_ids"], [1])
+        self.assertEqual(results["failed_action_ids"], [2])
+
+
+if __name__ == "__main__":
+    unittest.main()
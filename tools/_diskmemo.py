@@ -0,0 +1,73 @@
+"""
+Disk Memoization - Persists derived analytics across processes
+Shared by the data-backed tools (optional: needs diskcache)
+"""
+
+import functools
+import os
+from typing import Callable, Hashable
+
+from tools._jsoncache import dumps_bytes, loads
+
+try:
+    import diskcache
+    _DISKCACHE_AVAILABLE = True
+except ImportError:
+    _DISKCACHE_AVAILABLE = False
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '.cache', 'nba')
+
+# Entries for superseded data versions are never read again; let them expire
+ENTRY_TTL_SECONDS = 7 * 24 * 3600
+
+_cache = None
+
+
+def _get_cache():
+    """Open the shared on-disk cache on first use."""
+    global _cache
+    if _cache is None:
+        _cache = diskcache.Cache(CACHE_DIR)
+    return _cache
+
+
+def disk_memoize(version_fn: Callable[[], Hashable]) -> Callable:
+    """
+    Cache a function's JSON-serializable result on disk, across processes.
+
+    The key is (function, arguments, version_fn()), so results are recomputed
+    once the data they were derived from changes. Without diskcache installed
+    the function is returned unchanged.
+
+    Args:
+        version_fn: Returns the current version of the underlying data
+                    (e.g. a tuple of file mtimes)
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        if not _DISKCACHE_AVAILABLE:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                key = dumps_bytes([func.__module__, func.__qualname__, args, sorted(kwargs.items()), version_fn()])
+                cached = _get_cache().get(key)
+            except Exception:
+                # Unserializable arguments or an unusable cache directory
+                return func(*args, **kwargs)
+            if cached is not None:
+                return loads(cached)
+
+            result = func(*args, **kwargs)
+            try:
+                _get_cache().set(key, dumps_bytes(result), expire=ENTRY_TTL_SECONDS)
+            except Exception:
+                pass
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,67 @@
+"""
+JSON File Cache - Parses each data file once per modification
+Shared by the data-backed tools, which also use its loads()/dumps()
+(orjson when installed, else stdlib json)
+"""
+
+import functools
+import json
+import os
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON text or UTF-8 bytes (orjson when installed, else stdlib)."""
+    return orjson.loads(data) if _ORJSON_AVAILABLE else json.loads(data)
+
+
+def dumps_bytes(value: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes (orjson when installed, else stdlib)."""
+    if _ORJSON_AVAILABLE:
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(value, option=option)
+    return json.dumps(value, indent=2 if indent else None, sort_keys=sort_keys).encode()
+
+
+def dumps(value: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """Serialize to JSON text (orjson when installed, else stdlib)."""
+    return dumps_bytes(value, indent=indent, sort_keys=sort_keys).decode()
+
+
+def file_mtime(path: str) -> Optional[int]:
+    """A data file's mtime in ns (the version load_json() keys on), or None if it is missing."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+@functools.lru_cache(maxsize=8)
+def _load_json_cached(path: str, mtime_ns: int):
+    """Parse a JSON file; the mtime is part of the cache key so edits invalidate it."""
+    with open(path, 'rb') as f:
+        data = f.read()  # Both parsers take UTF-8 bytes directly
+    return loads(data)
+
+
+def load_json(path: str):
+    """
+    Load a JSON data file, reusing the parsed value until the file changes.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        Parsed JSON value - shared between callers, so treat it as read-only
+
+    Raises:
+        FileNotFoundError / json.JSONDecodeError, like open() + json.load()
+    """
+    path = os.path.abspath(path)
+    return _load_json_cached(path, os.stat(path).st_mtime_ns)
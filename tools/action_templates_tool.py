@@ -3,10 +3,30 @@ Action Templates Tool - Provides marketing action templates
 Used by Agent 3 (Action Generator)
 """
 
-import json
 import os
 from typing import Dict, List, Optional
 
+from tools._jsoncache import load_json
+
+TEMPLATES_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'action_templates.json')
+
+# template_id -> template, rebuilt whenever the cached templates file is re-read
+_TEMPLATE_INDEX: Dict[str, Dict] = {}
+_TEMPLATE_INDEX_SOURCE: Optional[Dict] = None
+
+# Recommended template ids per scenario
+SCENARIO_TEMPLATES = {
+    "cart_abandonment": ("cart_abandonment_basic", "cart_reminder_sms", "dynamic_product_ads"),
+    "win_back": ("win_back_campaign", "whats_new_showcase"),
+    "vip_nurture": ("vip_early_access", "personalized_recommendation"),
+    "first_time_visitor": ("welcome_new_customer", "social_proof_showcase"),
+    "repeat_customer": ("loyalty_reward_email", "replenishment_reminder"),
+    "seasonal": ("seasonal_preview_email",)
+}
+
+ALL_CHANNELS = ("email", "sms", "push", "retargeting_ads")
+DEFAULT_CHANNEL_RANKING = ("email", "push", "sms", "retargeting_ads")  # By ROI
+
 
 def get_action_templates(category: str = "all") -> Dict:
     """
@@ -19,11 +39,8 @@ def get_action_templates(category: str = "all") -> Dict:
     Returns:
         Action templates dictionary
     """
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'action_templates.json')
-    
     try:
-        with open(data_path, 'r') as f:
-            templates = json.load(f)
+        templates = load_json(TEMPLATES_PATH)
         
         action_types = templates.get('action_types', {})
         
@@ -51,18 +68,32 @@ def get_template_by_id(template_id: str) -> Optional[Dict]:
     Returns:
         Template dictionary or None
     """
-    all_templates = get_action_templates(category="all")
+    return _get_index().get(template_id)
+
+
+def _get_index() -> Dict[str, Dict]:
+    """
+    Return the template_id -> template index.
+    
+    load_json() hands back the same parsed object until the file's mtime
+    changes, so the index is rebuilt only when that object is replaced.
+    """
+    global _TEMPLATE_INDEX, _TEMPLATE_INDEX_SOURCE
     
+    all_templates = get_action_templates(category="all")
     if "error" in all_templates:
-        return None
+        return {}
     
-    # Search through all categories
-    for category, templates in all_templates.items():
-        for template in templates:
-            if template.get('template_id') == template_id:
-                return template
+    if all_templates is not _TEMPLATE_INDEX_SOURCE:
+        _TEMPLATE_INDEX = {
+            template['template_id']: template
+            for templates in all_templates.values()
+            for template in templates
+            if template.get('template_id')
+        }
+        _TEMPLATE_INDEX_SOURCE = all_templates
     
-    return None
+    return _TEMPLATE_INDEX
 
 
 def get_templates_by_scenario(scenario: str) -> List[Dict]:
@@ -76,16 +107,7 @@ def get_templates_by_scenario(scenario: str) -> List[Dict]:
     Returns:
         List of recommended templates
     """
-    scenario_mapping = {
-        "cart_abandonment": ["cart_abandonment_basic", "cart_reminder_sms", "dynamic_product_ads"],
-        "win_back": ["win_back_campaign", "whats_new_showcase"],
-        "vip_nurture": ["vip_early_access", "personalized_recommendation"],
-        "first_time_visitor": ["welcome_new_customer", "social_proof_showcase"],
-        "repeat_customer": ["loyalty_reward_email", "replenishment_reminder"],
-        "seasonal": ["seasonal_preview_email"]
-    }
-    
-    template_ids = scenario_mapping.get(scenario, [])
+    template_ids = SCENARIO_TEMPLATES.get(scenario, ())
     
     templates = []
     for tid in template_ids:
@@ -108,12 +130,11 @@ def get_channels_by_preference(preferred_channel: str = None) -> List[str]:
     """
     if preferred_channel:
         # Put preferred first, then others
-        all_channels = ["email", "sms", "push", "retargeting_ads"]
-        other_channels = [c for c in all_channels if c != preferred_channel]
+        other_channels = [c for c in ALL_CHANNELS if c != preferred_channel]
         return [preferred_channel] + other_channels
     else:
         # Default ranking (by ROI)
-        return ["email", "push", "sms", "retargeting_ads"]
+        return list(DEFAULT_CHANNEL_RANKING)
 
 
 def estimate_action_performance(template: Dict) -> Dict:
@@ -138,11 +159,8 @@ def estimate_action_performance(template: Dict) -> Dict:
 
 def get_action_combinations() -> Dict:
     """Get predefined action sequences for complex scenarios."""
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'action_templates.json')
-    
     try:
-        with open(data_path, 'r') as f:
-            templates = json.load(f)
+        templates = load_json(TEMPLATES_PATH)
         
         return templates.get('action_combinations', {})
     
@@ -3,9 +3,27 @@ Analytics Tool - Analyzes historical action performance
 Day 3 & 4 Concepts: Memory & Evaluation
 """
 
-import json
+import functools
 import os
-from typing import Dict, List
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from tools._diskmemo import disk_memoize
+from tools._jsoncache import file_mtime, load_json
+from tools.results_tracker_tool import (
+    ACTIONS_LOG_PATH,
+    ACTIONS_PATH,
+    buffered_version,
+    load_historical_actions,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+CUSTOMERS_PATH = os.path.join(DATA_DIR, 'sample_customers.json')
+PRODUCTS_PATH = os.path.join(DATA_DIR, 'product_catalog.json')
+
+# Below this many actions the per-action path is cheaper than building arrays
+VECTORIZE_MIN_ACTIONS = 8
 
 
 def get_historical_actions(customer_id: str = None) -> List[Dict]:
@@ -18,21 +36,90 @@ def get_historical_actions(customer_id: str = None) -> List[Dict]:
     Returns:
         List of historical actions
     """
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'historical_actions.json')
+    actions = load_historical_actions()
+    
+    if customer_id:
+        return [a for a in actions if a.get('customer_id') == customer_id]
+    
+    return actions
+
+
+# ============================================================================
+# INDEXES
+# ============================================================================
+class _AnalyticsIndexes(NamedTuple):
+    """Lookup tables built once per version of the data files."""
+    actions: List[Dict]
+    actions_by_type: Dict[str, List[Dict]]
+    customer_by_id: Dict[str, Dict]
+    converted_actions: List[Dict]
+    # (customer segment, product category) -> converted actions
+    successes_by_segment_category: Dict[Tuple[str, str], List[Dict]]
+
+
+def _data_version() -> Tuple:
+    """
+    Mtimes of every file the analytics are derived from, plus the results
+    recorded but not yet flushed to the action log.
+    
+    Recording a result changes buffered_version() and, once flushed, the log's
+    mtime, so either invalidates everything keyed on this version.
+    """
+    return tuple(
+        file_mtime(path) for path in (ACTIONS_PATH, ACTIONS_LOG_PATH, CUSTOMERS_PATH, PRODUCTS_PATH)
+    ) + (buffered_version(),)
+
+
+def _get_analytics_indexes() -> _AnalyticsIndexes:
+    """Return the analytics indexes, rebuilding them when a data file changes."""
+    return _build_indexes(_data_version())
+
+
+def warm() -> None:
+    """Build the analytics indexes ahead of the first query."""
+    _get_analytics_indexes()
+
+
+@functools.lru_cache(maxsize=1)
+def _build_indexes(version: Tuple) -> _AnalyticsIndexes:
+    """Build the indexes in one pass over the history (the data version is the cache key)."""
+    actions = get_historical_actions()
     
     try:
-        with open(data_path, 'r') as f:
-            actions = json.load(f)
-        
-        if customer_id:
-            return [a for a in actions if a.get('customer_id') == customer_id]
+        customer_by_id = {c['customer_id']: c for c in load_json(CUSTOMERS_PATH)}
+    except FileNotFoundError:
+        customer_by_id = {}
+    try:
+        category_by_product = {p['product_id']: p.get('category') for p in load_json(PRODUCTS_PATH)}
+    except FileNotFoundError:
+        category_by_product = {}
+    
+    actions_by_type: Dict[str, List[Dict]] = {}
+    converted_actions: List[Dict] = []
+    successes: Dict[Tuple[str, str], List[Dict]] = {}
+    for action in actions:
+        actions_by_type.setdefault(action.get('action_type'), []).append(action)
         
-        return actions
+        if not action.get('converted', False):
+            continue
+        converted_actions.append(action)
+        customer = customer_by_id.get(action.get('customer_id'))
+        category = category_by_product.get(action.get('product_recommended'))
+        if customer and category:
+            successes.setdefault((customer.get('segment'), category), []).append(action)
     
-    except FileNotFoundError:
-        return []
+    return _AnalyticsIndexes(actions, actions_by_type, customer_by_id, converted_actions, successes)
+
+
+# Indexes the memoized performance metrics were computed from
+_PERF_SOURCE: Optional[_AnalyticsIndexes] = None
 
 
+# ============================================================================
+# QUERIES
+# ============================================================================
+# Not disk-memoized: the in-process _perf_by_type() memo already makes this a
+# dict lookup, cheaper than hashing a key and reading it from disk
 def get_action_performance_by_type(action_type: str) -> Dict:
     """
     Calculate performance metrics for a specific action type.
@@ -43,9 +130,40 @@ def get_action_performance_by_type(action_type: str) -> Dict:
     Returns:
         Performance metrics dictionary
     """
-    actions = get_historical_actions()
-    filtered = [a for a in actions if a.get('action_type') == action_type]
+    return get_action_performance_by_types([action_type])[action_type]
+
+
+def get_action_performance_by_types(action_types: List[str]) -> Dict[str, Dict]:
+    """
+    Calculate performance metrics for several action types in one pass.
+    
+    Loads the history once, instead of once per action type.
+    
+    Args:
+        action_types: Action types to report on
+        
+    Returns:
+        Action type -> performance metrics dictionary
+    """
+    global _PERF_SOURCE
+    
+    # Cheap guard: the indexes object is replaced exactly when a data file changes
+    indexes = _get_analytics_indexes()
+    if indexes is not _PERF_SOURCE:
+        _perf_by_type.cache_clear()
+        _PERF_SOURCE = indexes
     
+    return {action_type: dict(_perf_by_type(action_type)) for action_type in action_types}
+
+
+@functools.lru_cache(maxsize=64)
+def _perf_by_type(action_type: str) -> Dict:
+    """Memoized _performance() of one action type (cleared when the indexes change)."""
+    return _performance(action_type, _get_analytics_indexes().actions_by_type.get(action_type, []))
+
+
+def _performance(action_type: str, filtered: List[Dict]) -> Dict:
+    """Performance metrics for the past actions of one type."""
     if not filtered:
         return {
             "action_type": action_type,
@@ -57,10 +175,18 @@ def get_action_performance_by_type(action_type: str) -> Dict:
         }
     
     total = len(filtered)
-    conversions = sum(1 for a in filtered if a.get('converted', False))
-    opens = sum(1 for a in filtered if a.get('opened', False))
-    clicks = sum(1 for a in filtered if a.get('clicked', False))
-    avg_roi = sum(a.get('roi', 0) for a in filtered) / total
+    # One pass over the records instead of one per metric
+    conversions = opens = clicks = 0
+    roi_sum = 0
+    for a in filtered:
+        if a.get('converted', False):
+            conversions += 1
+        if a.get('opened', False):
+            opens += 1
+        if a.get('clicked', False):
+            clicks += 1
+        roi_sum += a.get('roi', 0)
+    avg_roi = roi_sum / total
     
     return {
         "action_type": action_type,
@@ -72,6 +198,7 @@ def get_action_performance_by_type(action_type: str) -> Dict:
     }
 
 
+@disk_memoize(_data_version)
 def find_similar_successful_actions(customer_segment: str, product_category: str) -> List[Dict]:
     """
     Find successful actions for similar customers/products.
@@ -84,35 +211,10 @@ def find_similar_successful_actions(customer_segment: str, product_category: str
     Returns:
         List of successful similar actions
     """
-    from tools.customer_data_tool import get_all_customers
-    from tools.inventory_tool import get_product_info
-    
-    actions = get_historical_actions()
-    similar_actions = []
-    
-    for action in actions:
-        if not action.get('converted', False):
-            continue
-        
-        # Check if customer segment matches
-        customer_id = action.get('customer_id')
-        customers = get_all_customers()
-        customer = next((c for c in customers if c['customer_id'] == customer_id), None)
-        
-        if customer and customer.get('segment') == customer_segment:
-            # Check if product category matches
-            product_id = action.get('product_recommended')
-            product = get_product_info(product_id)
-            
-            if not isinstance(product, dict) or 'error' in product:
-                continue
-            
-            if product.get('category') == product_category:
-                similar_actions.append(action)
-    
-    return similar_actions
+    return list(_get_analytics_indexes().successes_by_segment_category.get((customer_segment, product_category), []))
 
 
+@disk_memoize(_data_version)
 def calculate_best_discount_range(customer_segment: str) -> Dict:
     """
     Analyze historical data to find optimal discount range.
@@ -123,26 +225,33 @@ def calculate_best_discount_range(customer_segment: str) -> Dict:
     Returns:
         Recommended discount range
     """
-    from tools.customer_data_tool import get_all_customers
+    indexes = _get_analytics_indexes()
     
-    actions = get_historical_actions()
-    customers = get_all_customers()
+    customer_by_id = indexes.customer_by_id
     
-    segment_actions = []
-    for action in actions:
-        customer = next((c for c in customers if c['customer_id'] == action['customer_id']), None)
-        if customer and customer.get('segment') == customer_segment and action.get('converted'):
-            segment_actions.append(action)
+    # Filter and aggregate in one pass, without an intermediate discounts list
+    count = 0
+    total = min_discount = max_discount = 0
+    for action in indexes.converted_actions:
+        customer = customer_by_id.get(action.get('customer_id'))
+        if not customer or customer.get('segment') != customer_segment:
+            continue
+        
+        discount = action.get('discount_percentage', 0)
+        if count == 0 or discount < min_discount:
+            min_discount = discount
+        if count == 0 or discount > max_discount:
+            max_discount = discount
+        total += discount
+        count += 1
     
-    if not segment_actions:
+    if not count:
         return {"min_discount": 10, "max_discount": 20, "avg_discount": 15}
     
-    discounts = [a.get('discount_percentage', 0) for a in segment_actions]
-    
     return {
-        "min_discount": min(discounts),
-        "max_discount": max(discounts),
-        "avg_discount": round(sum(discounts) / len(discounts), 1)
+        "min_discount": min_discount,
+        "max_discount": max_discount,
+        "avg_discount": round(total / count, 1)
     }
 
 
@@ -186,3 +295,43 @@ def score_action(action: Dict) -> Dict:
         "conversion_probability": conversion_rate,
         "confidence": "medium"
     }
+
+
+def score_actions_batch(actions: List[Dict]) -> List[Dict]:
+    """
+    Calculate ROI scores for many actions at once (same results as score_action).
+    
+    Historical performance is looked up once per distinct action type and the
+    score adjustments run as NumPy array operations.
+    
+    Args:
+        actions: Action dictionaries
+        
+    Returns:
+        Score dictionaries, in input order
+    """
+    if len(actions) < VECTORIZE_MIN_ACTIONS:
+        return [score_action(action) for action in actions]
+    
+    action_types = [action.get('action_type', 'unknown') for action in actions]
+    perf = get_action_performance_by_types(list(dict.fromkeys(action_types)))
+    
+    avg_roi = np.array([perf[t].get('avg_roi', 0) for t in action_types], dtype=np.float64)
+    costs = np.array([action.get('estimated_cost', 0) for action in actions], dtype=np.float64)
+    is_email = np.array([action.get('channel', 'email') == 'email' for action in actions])
+    
+    score = np.clip(avg_roi / 2, 1, 10)  # Normalize ROI to 1-10
+    score += np.where(costs < 50, 1.0, np.where(costs > 500, -1.0, 0.0))
+    score += np.where(is_email, 0.5, 0.0)
+    score = np.clip(score, 1, 10)
+    
+    return [
+        {
+            "action_id": action.get('action_id'),
+            "roi_score": round(float(action_score), 1),
+            "predicted_roi": perf[action_type].get('avg_roi', 0),
+            "conversion_probability": perf[action_type].get('conversion_rate', 0),
+            "confidence": "medium"
+        }
+        for action, action_type, action_score in zip(actions, action_types, score)
+    ]
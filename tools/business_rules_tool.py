@@ -3,9 +3,39 @@ Business Rules Tool - Validates action feasibility
 Used by Agent 4 (Validator)
 """
 
-import json
-import os
-from typing import Dict, List
+import asyncio
+from typing import Dict, List, Optional
+
+from tools.inventory_tool import _get_products_index
+
+# Budget constraints
+MAX_SPEND_PER_CUSTOMER_PER_MONTH = 10.00
+TOTAL_MONTHLY_BUDGET = 50000.00
+CURRENT_MONTH_SPEND = 23450.00  # Simulated
+
+# Simulated permission database
+CHANNEL_PERMISSIONS = {
+    "email": True,
+    "sms": True,  # Assume opt-in
+    "push": False,  # Not opted in
+    "whatsapp": False
+}
+
+# Estimated cost per send, used by validate_action()
+VALIDATION_CHANNEL_COSTS = {
+    "email": 0.05,
+    "sms": 0.15,
+    "push": 0.02,
+    "whatsapp": 0.10
+}
+
+# Estimated cost per send, used by get_action_cost()
+ACTION_CHANNEL_COSTS = {
+    "email": 0.05,
+    "sms": 0.15,
+    "push": 0.02,
+    "retargeting_ads": 0.75
+}
 
 
 def check_business_rules(rule_type: str, **kwargs) -> Dict:
@@ -40,15 +70,8 @@ def check_inventory_rules(product_id: str = None, **kwargs) -> Dict:
     if not product_id:
         return {"valid": True, "message": "No product check required"}
     
-    # Load product catalog
-    catalog_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'product_catalog.json')
-    
     try:
-        with open(catalog_path, 'r') as f:
-            products = json.load(f)
-        
-        # Find product
-        product = next((p for p in products if p.get('product_id') == product_id), None)
+        product = _get_products_index().get(product_id)
         
         if not product:
             return {
@@ -77,11 +100,6 @@ def check_inventory_rules(product_id: str = None, **kwargs) -> Dict:
 
 def check_budget_rules(action_cost: float = 0, customer_id: str = None, **kwargs) -> Dict:
     """Check if action is within marketing budget."""
-    # Define budget constraints
-    MAX_SPEND_PER_CUSTOMER_PER_MONTH = 10.00
-    TOTAL_MONTHLY_BUDGET = 50000.00
-    CURRENT_MONTH_SPEND = 23450.00  # Simulated
-    
     # Check customer spend limit
     if action_cost > MAX_SPEND_PER_CUSTOMER_PER_MONTH:
         return {
@@ -108,14 +126,6 @@ def check_budget_rules(action_cost: float = 0, customer_id: str = None, **kwargs
 
 def check_permission_rules(action_type: str = None, channel: str = None, **kwargs) -> Dict:
     """Check if we have permission to contact customer via channel."""
-    # Simulated permission database
-    CHANNEL_PERMISSIONS = {
-        "email": True,
-        "sms": True,  # Assume opt-in
-        "push": False,  # Not opted in
-        "whatsapp": False
-    }
-    
     if not channel:
         return {"valid": True, "message": "No channel specified"}
     
@@ -133,33 +143,75 @@ def check_permission_rules(action_type: str = None, channel: str = None, **kwarg
         }
 
 
-def validate_action(action: Dict) -> Dict:
+def validate_action(action: Dict, fast_fail: bool = False) -> Dict:
     """
     Comprehensive validation of a proposed action.
     
     Args:
         action: Action dictionary with keys: action_type, channel, product_id, etc.
+        fast_fail: Run the checks cheapest first (permissions, budget, inventory)
+                   and stop at the first failure; "checks" then only holds the
+                   checks that ran. Use when only pass/fail is needed.
         
     Returns:
         Validation results with overall valid/invalid status
     """
-    validations = []
+    if fast_fail:
+        return _validate_fast_fail(action)
     
+    inventory_check = None
     # Check inventory if product mentioned
     if 'product_id' in action:
         inventory_check = check_inventory_rules(product_id=action['product_id'])
-        validations.append(("inventory", inventory_check))
     
-    # Check budget (estimate cost based on channel)
-    channel_costs = {
-        "email": 0.05,
-        "sms": 0.15,
-        "push": 0.02,
-        "whatsapp": 0.10
+    return _combine_checks(action, inventory_check)
+
+
+async def validate_action_async(action: Dict) -> Dict:
+    """
+    Async variant of validate_action().
+    
+    Only the inventory check touches the catalog file, so it runs in a worker
+    thread; the budget and permission checks are pure lookups and run inline.
+    """
+    inventory_check = None
+    if 'product_id' in action:
+        inventory_check = await asyncio.to_thread(check_inventory_rules, product_id=action['product_id'])
+    
+    return _combine_checks(action, inventory_check)
+
+
+def _validate_fast_fail(action: Dict) -> Dict:
+    """validate_action(fast_fail=True): cheapest check first, stop on first failure."""
+    checks = {}
+    
+    checks["permissions"] = check_permission_rules(channel=action.get('channel'))
+    if checks["permissions"].get('valid', False):
+        checks["budget"] = check_budget_rules(action_cost=_validation_cost(action))
+        if checks["budget"].get('valid', False) and 'product_id' in action:
+            checks["inventory"] = check_inventory_rules(product_id=action['product_id'])
+    
+    return {
+        "overall_valid": all(check.get('valid', False) for check in checks.values()),
+        "checks": checks,
+        "action": action
     }
+
+
+def _validation_cost(action: Dict) -> float:
+    """Estimate the cost of an action from its channel."""
+    return VALIDATION_CHANNEL_COSTS.get(action.get('channel', 'email'), 0.05)
+
+
+def _combine_checks(action: Dict, inventory_check: Optional[Dict]) -> Dict:
+    """Add the budget and permission checks and compute overall validity."""
+    validations = []
+    
+    if inventory_check is not None:
+        validations.append(("inventory", inventory_check))
     
-    action_cost = channel_costs.get(action.get('channel', 'email'), 0.05)
-    budget_check = check_budget_rules(action_cost=action_cost)
+    # Check budget (estimate cost based on channel)
+    budget_check = check_budget_rules(action_cost=_validation_cost(action))
     validations.append(("budget", budget_check))
     
     # Check permissions
@@ -176,36 +228,62 @@ def validate_action(action: Dict) -> Dict:
     }
 
 
-def validate_actions_batch(actions: List[Dict]) -> Dict:
+def validate_actions_batch(actions: List[Dict], fast_fail: bool = False) -> Dict:
     """
     Validate a list of actions in batch.
     
     Args:
         actions: List of action dictionaries
+        fast_fail: Stop each action's checks at its first failure (see
+                   validate_action) - pass/fail ids are unchanged
         
     Returns:
         Dictionary with validation results for all actions
     """
-    results = []
+    return _summarize_batch(actions, [validate_action(action, fast_fail) for action in actions])
+
+
+async def validate_actions_batch_async(actions: List[Dict], fast_fail: bool = False) -> Dict:
+    """
+    Async variant of validate_actions_batch() that never blocks the event loop.
+    
+    The catalog is read and indexed once for the whole batch, in a worker
+    thread; after that every check is an in-memory lookup and runs inline.
+    
+    Args:
+        actions: List of action dictionaries
+        fast_fail: Stop each action's checks at its first failure (see
+                   validate_action) - pass/fail ids are unchanged
+        
+    Returns:
+        Dictionary with validation results for all actions, in input order
+    """
+    try:
+        await asyncio.to_thread(_get_products_index)
+    except FileNotFoundError:
+        pass  # check_inventory_rules reports the missing catalog
+    
+    return _summarize_batch(actions, [validate_action(action, fast_fail) for action in actions])
+
+
+def _summarize_batch(actions: List[Dict], results: List[Dict]) -> Dict:
+    """Tag each result with its action_id and split passed from failed."""
     passed_ids = []
     failed_ids = []
     
-    for action in actions:
-        result = validate_action(action)
+    for action, result in zip(actions, results):
         action_id = action.get('action_id', 'unknown')
         
         # Add action_id to result for tracking
         result['action_id'] = action_id
         
-        results.append(result)
-        
         if result['overall_valid']:
             passed_ids.append(action_id)
         else:
             failed_ids.append(action_id)
             
     return {
-        "validated_actions": results,
+        "validated_actions": list(results),
         "passed_action_ids": passed_ids,
         "failed_action_ids": failed_ids,
         "compliance_summary": f"{len(passed_ids)} out of {len(actions)} actions passed validation"
@@ -214,11 +292,4 @@ def validate_actions_batch(actions: List[Dict]) -> Dict:
 
 def get_action_cost(action_type: str, channel: str) -> float:
     """Get estimated cost for an action."""
-    channel_costs = {
-        "email": 0.05,
-        "sms": 0.15,
-        "push": 0.02,
-        "retargeting_ads": 0.75
-    }
-    
-    return channel_costs.get(channel.lower(), 0.05)
+    return ACTION_CHANNEL_COSTS.get(channel.lower(), 0.05)
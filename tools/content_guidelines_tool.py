@@ -3,9 +3,42 @@ Content Guidelines Tool - Provides content creation best practices
 Used by Agent 7 (Content Creator)
 """
 
-import json
 import os
-from typing import Dict, List, Optional
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+
+from tools._jsoncache import load_json
+
+# Mapping scenarios to tones (read-only: shared by every call)
+SCENARIO_TONES = MappingProxyType({
+    "cart_abandonment": "urgent",
+    "win_back": "friendly",
+    "vip_nurture": "professional",
+    "welcome": "helpful",
+    "flash_sale": "urgent",
+    "replenishment": "helpful"
+})
+
+SCENARIO_CTAS = MappingProxyType({
+    "cart_abandonment": ("Complete My Purchase", "Finish Checkout", "Get My Discount"),
+    "win_back": ("Come Back & Save", "Start Shopping", "See What's New"),
+    "vip_nurture": ("Shop The Collection", "View Your Picks", "Get Early Access"),
+    "discount_offer": ("Shop Now", "Claim My Discount", "Unlock My Deal"),
+    "replenishment": ("Reorder Now", "Stock Up", "Add to Cart")
+})
+DEFAULT_CTAS = ("Shop Now", "Learn More", "Get Started")
+
+GUIDELINES_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'content_guidelines.json')
+
+# channel -> (max length, blocking?, message), rebuilt whenever the cached
+# guidelines are re-read. Blocking violations are issues, the rest warnings.
+_CHANNEL_LIMITS: Dict[str, Tuple[int, bool, str]] = {}
+_CHANNEL_LIMITS_SOURCE: Optional[Dict] = None
+
+# Personalization tokens look like {{customer_name}}
+_TOKEN_RE = re.compile(r"\{\{(\w+)\}\}")
 
 
 def query_content_guidelines(guideline_type: str = "all") -> Dict:
@@ -20,11 +53,8 @@ def query_content_guidelines(guideline_type: str = "all") -> Dict:
     Returns:
         Content guidelines dictionary
     """
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'content_guidelines.json')
-    
     try:
-        with open(data_path, 'r', encoding='utf-8') as f:
-            guidelines = json.load(f)
+        guidelines = load_json(GUIDELINES_PATH)
         
         if guideline_type == "all":
             return guidelines
@@ -51,6 +81,19 @@ def query_content_guidelines(guideline_type: str = "all") -> Dict:
         return {"error": "Content guidelines file not found"}
 
 
+def _get_guidelines() -> Dict:
+    """
+    Return the full (cached) guidelines dict for the helpers below.
+    
+    Returns:
+        Guidelines dictionary, or {} if the file is missing
+    """
+    try:
+        return load_json(GUIDELINES_PATH)
+    except FileNotFoundError:
+        return {}
+
+
 def get_subject_line_formula(scenario: str) -> Dict:
     """
     Get subject line formula for a scenario.
@@ -61,8 +104,7 @@ def get_subject_line_formula(scenario: str) -> Dict:
     Returns:
         Subject line formulas
     """
-    guidelines = query_content_guidelines(guideline_type="subject_lines")
-    formulas = guidelines.get('subject_line_formulas', {})
+    formulas = _get_guidelines().get('subject_line_formulas', {})
     
     if scenario in formulas:
         return formulas[scenario]
@@ -83,47 +125,97 @@ def get_content_template(scenario: str) -> Optional[Dict]:
     Returns:
         Content template dictionary
     """
-    guidelines = query_content_guidelines(guideline_type="templates")
-    templates = guidelines.get('content_templates_by_scenario', {})
+    templates = _get_guidelines().get('content_templates_by_scenario', {})
     
     return templates.get(scenario)
 
 
-def personalize_content(template_text: str, customer_data: Dict, product_data: Dict = None) -> str:
+@lru_cache(maxsize=256)
+def compile_template(template_text: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
     """
-    Replace personalization tokens in content.
+    Split a template into literal chunks and token names, once per template.
     
     Args:
         template_text: Text with tokens like {{customer_name}}
-        customer_data: Customer data dictionary
-        product_data: Optional product data
         
     Returns:
-        Personalized content string
+        (chunks, tokens) with len(chunks) == len(tokens) + 1; token i sits
+        between chunks[i] and chunks[i + 1]
+    """
+    parts = _TOKEN_RE.split(template_text)
+    return tuple(parts[0::2]), tuple(parts[1::2])
+
+
+def apply_compiled(compiled: Tuple[Tuple[str, ...], Tuple[str, ...]], values: Dict) -> str:
     """
-    content = template_text
+    Fill a compiled template.
     
+    Args:
+        compiled: Result of compile_template()
+        values: Token name -> value; tokens without a value are kept as {{name}}
+        
+    Returns:
+        Personalized content string
+    """
+    chunks, tokens = compiled
+    out = [chunks[0]]
+    for token, chunk in zip(tokens, chunks[1:]):
+        out.append(str(values[token]) if token in values else "{{" + token + "}}")
+        out.append(chunk)
+    return "".join(out)
+
+
+def _personalization_tokens(customer_data: Dict, product_data: Optional[Dict] = None) -> Dict:
+    """Token name -> value for one customer (and optional product)."""
     # Customer tokens
     tokens = {
-        "{{customer_name}}": customer_data.get('name', 'Valued Customer'),
-        "{{first_name}}": customer_data.get('name', '').split()[0] if customer_data.get('name') else 'there',
-        "{{days_since_purchase}}": str(customer_data.get('days_since_last_purchase', 0)),
-        "{{loyalty_tier}}": customer_data.get('segment', 'valued'),
+        "customer_name": customer_data.get('name', 'Valued Customer'),
+        "first_name": customer_data.get('name', '').split()[0] if customer_data.get('name') else 'there',
+        "days_since_purchase": str(customer_data.get('days_since_last_purchase', 0)),
+        "loyalty_tier": customer_data.get('segment', 'valued'),
     }
     
     # Product tokens if provided
     if product_data:
         tokens.update({
-            "{{product_name}}": product_data.get('name', 'your item'),
-            "{{category}}": product_data.get('category', 'product'),
-            "{{original_price}}": str(product_data.get('price', 0)),
+            "product_name": product_data.get('name', 'your item'),
+            "category": product_data.get('category', 'product'),
+            "original_price": str(product_data.get('price', 0)),
         })
     
-    # Replace all tokens
-    for token, value in tokens.items():
-        content = content.replace(token, str(value))
+    return tokens
+
+
+def personalize_content(template_text: str, customer_data: Dict, product_data: Dict = None) -> str:
+    """
+    Replace personalization tokens in content.
+    
+    Args:
+        template_text: Text with tokens like {{customer_name}}
+        customer_data: Customer data dictionary
+        product_data: Optional product data
+        
+    Returns:
+        Personalized content string
+    """
+    # Templates are reused across customers, so only the fill runs per call
+    return apply_compiled(compile_template(template_text), _personalization_tokens(customer_data, product_data))
+
+
+def personalize_batch(template_text: str, rows: List[Dict], product_data: Dict = None) -> List[str]:
+    """
+    Personalize one template for many customers.
     
-    return content
+    Args:
+        template_text: Text with tokens like {{customer_name}}
+        rows: Customer data dictionaries
+        product_data: Optional product data shared by every row
+        
+    Returns:
+        Personalized content strings, aligned with rows
+    """
+    compiled = compile_template(template_text)
+    return [apply_compiled(compiled, _personalization_tokens(row, product_data)) for row in rows]
 
 
 def get_brand_tone(scenario: str, customer_segment: str = "general") -> str:
@@ -137,17 +229,31 @@ def get_brand_tone(scenario: str, customer_segment: str = "general") -> str:
     Returns:
         Recommended tone ('professional', 'friendly', 'urgent', 'helpful')
     """
-    # Mapping scenarios to tones
-    tone_mapping = {
-        "cart_abandonment": "urgent",
-        "win_back": "friendly",
-        "vip_nurture": "professional",
-        "welcome": "helpful",
-        "flash_sale": "urgent",
-        "replenishment": "helpful"
-    }
+    return SCENARIO_TONES.get(scenario, "friendly")
+
+
+def _get_channel_limits() -> Dict[str, Tuple[int, bool, str]]:
+    """Return the per-channel length limits from the (cached) guidelines."""
+    global _CHANNEL_LIMITS, _CHANNEL_LIMITS_SOURCE
     
-    return tone_mapping.get(scenario, "friendly")
+    guidelines = _get_guidelines()
+    if guidelines is not _CHANNEL_LIMITS_SOURCE:
+        # Email checks the subject line length (if it's a subject)
+        subject_guidelines = guidelines.get('email_structure_best_practices', {}).get('subject_line', {})
+        sms_guidelines = guidelines.get('sms_guidelines', {})
+        push_guidelines = guidelines.get('push_notification_guidelines', {})
+        
+        _CHANNEL_LIMITS = {
+            "email": (subject_guidelines.get('max_length_chars', 50), False,
+                      "Content length ({length}) exceeds recommended {limit} chars"),
+            "sms": (sms_guidelines.get('max_length_chars', 160), True,
+                    "SMS content ({length} chars) exceeds limit of {limit}"),
+            "push": (push_guidelines.get('body_max_chars', 120), False,
+                     "Push notification content may be truncated"),
+        }
+        _CHANNEL_LIMITS_SOURCE = guidelines
+    
+    return _CHANNEL_LIMITS
 
 
 def validate_content(content: str, channel: str) -> Dict:
@@ -163,39 +269,18 @@ def validate_content(content: str, channel: str) -> Dict:
     """
     issues = []
     warnings = []
+    length = len(content)
     
-    if channel == "email":
-        guidelines = query_content_guidelines(guideline_type="email_structure")
-        email_best = guidelines.get('email_structure_best_practices', {})
-        
-        # Check subject line length (if it's a subject)
-        subject_guidelines = email_best.get('subject_line', {})
-        max_length = subject_guidelines.get('max_length_chars', 50)
-        
-        if len(content) > max_length:
-            warnings.append(f"Content length ({len(content)}) exceeds recommended {max_length} chars")
-    
-    elif channel == "sms":
-        guidelines = query_content_guidelines(guideline_type="sms")
-        sms_guidelines = guidelines.get('sms_guidelines', {})
-        max_length = sms_guidelines.get('max_length_chars', 160)
-        
-        if len(content) > max_length:
-            issues.append(f"SMS content ({len(content)} chars) exceeds limit of {max_length}")
-    
-    elif channel == "push":
-        guidelines = query_content_guidelines(guideline_type="push")
-        push_guidelines = guidelines.get('push_notification_guidelines', {})
-        max_body = push_guidelines.get('body_max_chars', 120)
-        
-        if len(content) > max_body:
-            warnings.append(f"Push notification content may be truncated")
+    limit = _get_channel_limits().get(channel)
+    if limit is not None and length > limit[0]:
+        max_length, blocking, message = limit
+        (issues if blocking else warnings).append(message.format(length=length, limit=max_length))
     
     return {
         "valid": len(issues) == 0,
         "issues": issues,
         "warnings": warnings,
-        "character_count": len(content)
+        "character_count": length
     }
 
 
@@ -209,12 +294,4 @@ def get_call_to_action(scenario: str) -> List[str]:
     Returns:
         List of CTA options
     """
-    cta_mapping = {
-        "cart_abandonment": ["Complete My Purchase", "Finish Checkout", "Get My Discount"],
-        "win_back": ["Come Back & Save", "Start Shopping", "See What's New"],
-        "vip_nurture": ["Shop The Collection", "View Your Picks", "Get Early Access"],
-        "discount_offer": ["Shop Now", "Claim My Discount", "Unlock My Deal"],
-        "replenishment": ["Reorder Now", "Stock Up", "Add to Cart"]
-    }
-    
-    return cta_mapping.get(scenario, ["Shop Now", "Learn More", "Get Started"])
+    return list(SCENARIO_CTAS.get(scenario, DEFAULT_CTAS))
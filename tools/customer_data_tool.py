@@ -3,9 +3,39 @@ Customer Data Tool - Fetches customer information
 Day 2 Concept: Tools & MCP
 """
 
-import json
 import os
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from tools._jsoncache import load_json
+
+CUSTOMERS_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_customers.json')
+
+# customer_id -> customer and segment -> customers, rebuilt whenever the
+# cached customer database is re-read
+_CUSTOMERS_BY_ID: Dict[str, Dict] = {}
+_CUSTOMERS_BY_SEGMENT: Dict[str, List[Dict]] = {}
+_CUSTOMERS_SOURCE: Optional[List[Dict]] = None
+
+
+def _refresh_customer_indexes() -> None:
+    """
+    Rebuild the customer indexes if the parsed customer database changed.
+    
+    load_json() hands back the same parsed list until the file's mtime
+    changes, so the indexes are rebuilt only when that list is replaced.
+    
+    Raises:
+        FileNotFoundError: If the customer database is missing
+    """
+    global _CUSTOMERS_BY_ID, _CUSTOMERS_BY_SEGMENT, _CUSTOMERS_SOURCE
+    
+    customers = load_json(CUSTOMERS_PATH)
+    if customers is not _CUSTOMERS_SOURCE:
+        by_id, by_segment = {}, {}
+        for customer in customers:
+            by_id.setdefault(customer.get('customer_id'), customer)  # First match wins, as before
+            by_segment.setdefault(customer.get('segment'), []).append(customer)
+        _CUSTOMERS_BY_ID, _CUSTOMERS_BY_SEGMENT, _CUSTOMERS_SOURCE = by_id, by_segment, customers
 
 
 def get_customer_data(customer_id: str) -> Dict:
@@ -18,15 +48,11 @@ def get_customer_data(customer_id: str) -> Dict:
     Returns:
         Dictionary containing customer information
     """
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_customers.json')
-    
     try:
-        with open(data_path, 'r') as f:
-            customers = json.load(f)
-        
-        for customer in customers:
-            if customer['customer_id'] == customer_id:
-                return customer
+        _refresh_customer_indexes()
+        customer = _CUSTOMERS_BY_ID.get(customer_id)
+        if customer is not None:
+            return customer
         
         return {"error": f"Customer {customer_id} not found"}
     
@@ -41,11 +67,8 @@ def get_all_customers() -> list:
     Returns:
         List of all customer dictionaries
     """
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_customers.json')
-    
     try:
-        with open(data_path, 'r') as f:
-            return json.load(f)
+        return list(load_json(CUSTOMERS_PATH))  # Copy: the parsed list is shared
     except FileNotFoundError:
         return []
 
@@ -60,5 +83,8 @@ def search_customers_by_segment(segment: str) -> list:
     Returns:
         List of matching customers
     """
-    customers = get_all_customers()
-    return [c for c in customers if c.get('segment') == segment]
+    try:
+        _refresh_customer_indexes()
+    except FileNotFoundError:
+        return []
+    return list(_CUSTOMERS_BY_SEGMENT.get(segment, ()))
@@ -5,7 +5,332 @@ Used by Agent 2 (Pattern Matcher)
 
 import json
 import os
-from typing import Dict, List, Optional
+import tempfile
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tools._jsoncache import file_mtime, load_json, loads
+from tools.results_tracker_tool import (
+    ACTIONS_LOG_PATH,
+    ACTIONS_PATH,
+    buffered_version,
+    load_historical_actions,
+)
+
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+@lru_cache(maxsize=128)
+def _parse_profile(profile_json: str) -> Dict:
+    """
+    Parse a customer profile JSON string, once per distinct string.
+
+    Agents pass the same profile text to several tool calls in a run. The
+    returned dict is shared between callers and must not be mutated.
+    """
+    return loads(profile_json)
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+CUSTOMERS_PATH = os.path.join(DATA_DIR, 'sample_customers.json')
+HISTORICAL_DATA_PATH = os.path.join(DATA_DIR, 'historical_customer_data.json')
+FEATURES_CACHE_PATH = os.path.join(DATA_DIR, 'customer_features.npy')
+
+# Segment vocabularies from the customer DB and from generated profiles,
+# mapped onto one ordinal value scale
+SEGMENT_CODES = {
+    "low_value": 0, "value_conscious": 0,
+    "medium_value": 1,
+    "high_value": 2, "premium": 2,
+    "vip": 3,
+}
+
+# Feature columns: segment_id, total_spent, total_orders, days_since, engagement
+N_FEATURES = 5
+SIMILAR_CUSTOMERS_TOP_K = 3
+
+# (customers mtime, (customer_ids, features, feature_scale)), published in a
+# single assignment so a concurrent reader (e.g. the coordinator's prewarm
+# thread) never sees a half-built set
+_customer_features: Optional[Tuple[Optional[int], Tuple[List[str], np.ndarray, np.ndarray]]] = None
+_features_lock = threading.Lock()
+
+# Historical segment for each combination of the profile traits that decide
+# it: (cart abandoned, vip, churn risk or lapsed > 60 days, no orders,
+# 3+ orders). Earlier traits take precedence, as in the original if/elif chain.
+def _segment_for(abandoned: bool, vip: bool, lapsing: bool, no_orders: bool, repeat: bool) -> str:
+    if abandoned:
+        return 'price_sensitive_cart_abandoners'
+    if vip:
+        return 'vip_customers'
+    if lapsing:
+        return 'high_churn_risk'
+    if no_orders:
+        return 'first_time_browsers'
+    if repeat:
+        return 'repeat_buyers'
+    return 'first_time_browsers'
+
+
+# Indexed by the traits packed as bits, most significant first
+_SEGMENT_TABLE = tuple(
+    _segment_for(*((code >> shift) & 1 == 1 for shift in range(4, -1, -1)))
+    for code in range(32)
+)
+_SEGMENT_TABLE_ARRAY = np.array(_SEGMENT_TABLE)
+
+# Struct-of-arrays view of the campaign history (see load_history_soa)
+ACTION_TYPE_CODES: Dict[str, int] = {}
+# (data version, columns) - see _history_version()
+_history: Optional[Tuple[Tuple, Dict]] = None
+_history_lock = threading.Lock()
+
+# Historical data the memoized per-segment answers were computed from
+_SEGMENT_ANSWERS_SOURCE: Optional[Dict] = None
+
+
+def _engagement(value) -> float:
+    """Engagement on a 0-1 scale (the customer DB stores it as 0-10)."""
+    value = float(value or 0)
+    return value / 10 if value > 1 else value
+
+
+def _profile_features(profile: Dict) -> np.ndarray:
+    """Encode a customer profile as a float32 feature row."""
+    behavior = profile.get('behavior', {}) if isinstance(profile.get('behavior'), dict) else {}
+    return np.array([
+        SEGMENT_CODES.get(profile.get('segment'), 1),
+        profile.get('total_spent', profile.get('lifetime_value', 0)) or 0,
+        profile.get('total_orders', 0) or 0,
+        profile.get('days_since_last_purchase', 0) or 0,
+        _engagement(profile.get('engagement_score', behavior.get('engagement_score', 0))),
+    ], dtype=np.float32)
+
+
+def _load_customer_features() -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Load the historical customer DB as a contiguous (N, F) float32 matrix.
+
+    The matrix is cached on disk as .npy and rebuilt when the JSON is newer;
+    the in-memory copy is keyed on the JSON's mtime the same way.
+
+    Returns:
+        (customer_ids, features, feature_scale), all built from the same load
+    """
+    global _customer_features
+    version = file_mtime(CUSTOMERS_PATH)
+    loaded = _customer_features
+    if loaded is not None and loaded[0] == version:
+        return loaded[1]
+
+    with _features_lock:
+        if _customer_features is None or _customer_features[0] != version:
+            _customer_features = (version, _build_customer_features())
+        return _customer_features[1]
+
+
+def _build_customer_features() -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Build the ids, feature matrix and column scale for _load_customer_features()."""
+    try:
+        customers = load_json(CUSTOMERS_PATH)
+    except FileNotFoundError:
+        customers = []
+
+    customer_ids = [c.get('customer_id') for c in customers]
+
+    features = None
+    cache_fresh = (
+        os.path.exists(FEATURES_CACHE_PATH)
+        and os.path.exists(CUSTOMERS_PATH)
+        and os.path.getmtime(FEATURES_CACHE_PATH) >= os.path.getmtime(CUSTOMERS_PATH)
+    )
+    if cache_fresh:
+        try:
+            features = np.load(FEATURES_CACHE_PATH)
+        except (OSError, ValueError):
+            features = None  # Unreadable cache - rebuild it below
+    if features is None or features.shape != (len(customers), N_FEATURES):
+        features = np.ascontiguousarray(
+            np.array([_profile_features(c) for c in customers], dtype=np.float32).reshape(-1, N_FEATURES)
+        )
+        _save_features_cache(features)
+
+    # Per-column scale so large spend values don't dominate the distance
+    scale = features.std(axis=0) if len(features) else np.ones(N_FEATURES, dtype=np.float32)
+    feature_scale = np.where(scale > 0, scale, 1).astype(np.float32)
+
+    return customer_ids, features, feature_scale
+
+
+def _save_features_cache(features: np.ndarray) -> None:
+    """Write the .npy cache via a temp file, so other processes never load a partial matrix."""
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(FEATURES_CACHE_PATH), suffix='.npy.tmp')
+    except OSError:
+        return  # Read-only data dir - keep the in-memory matrix
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, features)
+        os.replace(tmp_path, FEATURES_CACHE_PATH)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+if _NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _score_segments(features: np.ndarray, target: np.ndarray) -> np.ndarray:
+        """Similarity (0-1] of every scaled feature row to the scaled target."""
+        n_rows, n_cols = features.shape
+        scores = np.empty(n_rows, dtype=np.float32)
+        for i in prange(n_rows):
+            dist = 0.0
+            for j in range(n_cols):
+                diff = features[i, j] - target[j]
+                dist += diff * diff
+            scores[i] = 1.0 / (1.0 + np.sqrt(dist))
+        return scores
+else:
+    def _score_segments(features: np.ndarray, target: np.ndarray) -> np.ndarray:
+        """Similarity (0-1] of every scaled feature row to the scaled target."""
+        dist = np.sqrt(((features - target) ** 2).sum(axis=1))
+        return (1.0 / (1.0 + dist)).astype(np.float32)
+
+
+def load_history_soa() -> Dict:
+    """
+    Load the historical campaign store as parallel numpy columns.
+
+    Each record becomes one row across the columns, so filters and averages
+    are vectorized numpy ops instead of a Python walk over dicts. Outcome
+    columns are NaN for actions whose result isn't known yet.
+
+    Returns:
+        Dictionary with segment_ids (int8), total_spent (float32),
+        conversion_rate (float32), roi (float32), action_type (int8) and
+        records (the original dicts, in row order)
+    """
+    global _history
+    version = _history_version()
+    loaded = _history
+    if loaded is not None and loaded[0] == version:
+        return loaded[1]
+
+    with _history_lock:
+        if _history is None or _history[0] != version:
+            _history = (version, _build_history_soa())
+        return _history[1]
+
+
+def _history_version() -> Tuple:
+    """
+    Version of the data the history columns are built from - the same one
+    analytics_tool keys its indexes on: the store, action log and customer DB
+    mtimes plus the results recorded but not yet flushed.
+    """
+    return tuple(
+        file_mtime(path) for path in (ACTIONS_PATH, ACTIONS_LOG_PATH, CUSTOMERS_PATH)
+    ) + (buffered_version(),)
+
+
+def _build_history_soa() -> Dict:
+    """Build the columns for load_history_soa() (called with _history_lock held)."""
+    try:
+        records = load_historical_actions()
+    except json.JSONDecodeError:
+        records = []
+
+    # Older records only carry a customer_id - join segment and spend from the customer DB
+    try:
+        customers = {c.get('customer_id'): c for c in load_json(CUSTOMERS_PATH)}
+    except (FileNotFoundError, json.JSONDecodeError):
+        customers = {}
+
+    for record in records:
+        ACTION_TYPE_CODES.setdefault(record.get('action_type'), len(ACTION_TYPE_CODES))
+
+    def column(values, dtype):
+        return np.array(values, dtype=dtype).reshape(len(records))
+
+    def outcome(value):
+        return np.nan if value is None else float(value)
+
+    customer_of = [customers.get(r.get('customer_id'), {}) for r in records]
+    return {
+        "segment_ids": column(
+            [SEGMENT_CODES.get(r.get('customer_segment') or c.get('segment'), -1)
+             for r, c in zip(records, customer_of)],
+            np.int8
+        ),
+        "total_spent": column([c.get('lifetime_value', 0) for c in customer_of], np.float32),
+        "conversion_rate": column([outcome(r.get('converted')) for r in records], np.float32),
+        "roi": column([outcome(r.get('roi')) for r in records], np.float32),
+        "action_type": column([ACTION_TYPE_CODES[r.get('action_type')] for r in records], np.int8),
+        "records": records,
+    }
+
+
+def query_action_history(segment: str, action_type: str) -> Dict:
+    """
+    Query past outcomes of an action type for a customer segment.
+
+    Args:
+        segment: Customer segment (e.g., 'premium', 'vip', 'value_conscious')
+        action_type: Action type (e.g., 'email_discount', 'abandoned_cart_reminder')
+
+    Returns:
+        Conversion rate, average ROI and sample size of matching past actions
+    """
+    history = load_history_soa()
+
+    mask = (
+        (history["segment_ids"] == SEGMENT_CODES.get(segment, -1))
+        & (history["action_type"] == ACTION_TYPE_CODES.get(action_type, -1))
+    )
+    conversions = history["conversion_rate"][mask]
+    rois = history["roi"][mask]
+    measured = ~np.isnan(conversions)
+
+    return {
+        "segment": segment,
+        "action_type": action_type,
+        "total_actions": int(mask.sum()),
+        "sample_size": int(measured.sum()),
+        "conversion_rate": round(float(conversions[measured].mean()), 2) if measured.any() else None,
+        "avg_roi": round(float(np.nanmean(rois)), 2) if (~np.isnan(rois)).any() else None,
+    }
+
+
+def find_similar_customers(customer_profile: Dict, top_k: int = SIMILAR_CUSTOMERS_TOP_K) -> List[Dict]:
+    """
+    Find the historical customers most similar to a profile.
+
+    Args:
+        customer_profile: Customer profile dictionary
+        top_k: Number of lookalike customers to return
+
+    Returns:
+        List of {"customer_id", "similarity"} sorted by similarity
+    """
+    customer_ids, features, scale = _load_customer_features()
+    if not customer_ids:
+        return []
+
+    scores = _score_segments(features / scale, _profile_features(customer_profile) / scale)
+    top = np.argsort(-scores)[:top_k]
+
+    return [
+        {"customer_id": customer_ids[i], "similarity": round(float(scores[i]), 3)}
+        for i in top
+    ]
 
 
 def query_historical_patterns(segment: str = None, data_type: str = "all") -> Dict:
@@ -19,11 +344,8 @@ def query_historical_patterns(segment: str = None, data_type: str = "all") -> Di
     Returns:
         Dictionary with historical pattern data
     """
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'historical_customer_data.json')
-    
     try:
-        with open(data_path, 'r') as f:
-            historical_data = json.load(f)
+        historical_data = load_json(HISTORICAL_DATA_PATH)
         
         # If specific segment requested
         if segment:
@@ -56,6 +378,71 @@ def query_historical_patterns(segment: str = None, data_type: str = "all") -> Di
         return {"error": "Error parsing historical data"}
 
 
+def _segment_key(profile: Dict) -> int:
+    """Pack the traits that decide a profile's historical segment into an index into _SEGMENT_TABLE."""
+    total_orders = profile.get('total_orders', 0) or 0
+    return (
+        (profile.get('cart_status', 'empty') == 'abandoned') << 4
+        | (profile.get('segment', 'medium_value') == 'vip') << 3
+        | (profile.get('churn_risk', 'low') == 'high'
+           or (profile.get('days_since_last_purchase', 0) or 0) > 60) << 2
+        | (total_orders == 0) << 1
+        | (total_orders >= 3)
+    )
+
+
+def classify_segments(profiles: List[Dict]) -> List[str]:
+    """
+    Match many customer profiles to historical segments at once.
+    
+    Args:
+        profiles: Customer profile dictionaries
+        
+    Returns:
+        Historical segment names, aligned with profiles
+    """
+    if not profiles:
+        return []
+    
+    def column(key, default):
+        return np.array([p.get(key, default) for p in profiles], dtype=object)
+    
+    total_orders = np.array([p.get('total_orders', 0) or 0 for p in profiles], dtype=np.float64)
+    days_since = np.array([p.get('days_since_last_purchase', 0) or 0 for p in profiles], dtype=np.float64)
+    
+    codes = (
+        (column('cart_status', 'empty') == 'abandoned').astype(np.int8) << 4
+        | (column('segment', 'medium_value') == 'vip').astype(np.int8) << 3
+        | ((column('churn_risk', 'low') == 'high') | (days_since > 60)).astype(np.int8) << 2
+        | (total_orders == 0).astype(np.int8) << 1
+        | (total_orders >= 3).astype(np.int8)
+    )
+    return _SEGMENT_TABLE_ARRAY[codes].tolist()
+
+
+def _get_historical_data() -> Optional[Dict]:
+    """The full (cached) historical data, or None if missing or unreadable."""
+    try:
+        return load_json(HISTORICAL_DATA_PATH)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def warm() -> None:
+    """Load the customer features, campaign history and segment data ahead of the first tool call."""
+    _load_customer_features()
+    load_history_soa()
+    _get_historical_data()
+
+
+def _get_segment_data(segment: str) -> Optional[Dict]:
+    """One segment's historical data, read straight from the cached root dict."""
+    historical_data = _get_historical_data()
+    if historical_data is None:
+        return None
+    return historical_data.get('customer_segments', {}).get(segment)
+
+
 def find_similar_customer_segment(customer_profile_json: str) -> Dict:
     """
     Find the most similar customer segment based on profile.
@@ -67,40 +454,19 @@ def find_similar_customer_segment(customer_profile_json: str) -> Dict:
         Best matching segment with success rates
     """
     # Parse JSON string to dict
-    import json as json_lib
     try:
-        customer_profile = json_lib.loads(customer_profile_json)
-    except (json_lib.JSONDecodeError, TypeError):
+        customer_profile = _parse_profile(customer_profile_json)
+    except (json.JSONDecodeError, TypeError):
         # If it's already a dict (shouldn't happen, but defensive)
         customer_profile = customer_profile_json if isinstance(customer_profile_json, dict) else {}
     
-    # Simple matching logic based on key attributes
-    churn_risk = customer_profile.get('churn_risk', 'low')
-    cart_status = customer_profile.get('cart_status', 'empty')
-    segment = customer_profile.get('segment', 'medium_value')
-    total_orders = customer_profile.get('total_orders', 0)
-    days_since_purchase = customer_profile.get('days_since_last_purchase', 0)
-    
-    # Determine segment
-    if cart_status == 'abandoned':
-        matched_segment = 'price_sensitive_cart_abandoners'
-    elif segment == 'vip':
-        matched_segment = 'vip_customers'
-    elif churn_risk == 'high' or days_since_purchase > 60:
-        matched_segment = 'high_churn_risk'
-    elif total_orders == 0:
-        matched_segment = 'first_time_browsers'
-    elif total_orders >= 3:
-        matched_segment = 'repeat_buyers'
-    else:
-        matched_segment = 'first_time_browsers'
-    
-    # Get segment data
-    result = query_historical_patterns(segment=matched_segment)
+    # Determine segment from the key attributes (one table lookup)
+    matched_segment = _SEGMENT_TABLE[_segment_key(customer_profile)]
     
     return {
         "matched_segment": matched_segment,
-        "segment_data": result.get('data', {}),
+        "segment_data": _get_segment_data(matched_segment) or {},
+        "similar_customers": find_similar_customers(customer_profile),
         "confidence": 0.85  # Placeholder confidence score
     }
 
@@ -116,18 +482,8 @@ def get_action_success_rate(action_type: str, segment: str) -> float:
     Returns:
         Success rate (0.0 to 1.0)
     """
-    segment_data = query_historical_patterns(segment=segment)
-    
-    if "error" in segment_data:
-        return 0.5  # Default if no data
-    
-    successful_actions = segment_data.get('data', {}).get('successful_actions', [])
-    
-    for action in successful_actions:
-        if action_type.lower() in action.get('action', '').lower():
-            return action.get('success_rate', 0.5)
-    
-    return 0.5  # Default
+    _refresh_segment_answers()
+    return _success_rate(segment, action_type.lower())
 
 
 def get_best_performing_action(segment: str) -> Dict:
@@ -140,12 +496,49 @@ def get_best_performing_action(segment: str) -> Dict:
     Returns:
         Best action details
     """
-    segment_data = query_historical_patterns(segment=segment)
+    _refresh_segment_answers()
+    return dict(_best_action(segment))
+
+
+def _refresh_segment_answers() -> None:
+    """Drop the memoized per-segment answers if the historical data changed."""
+    global _SEGMENT_ANSWERS_SOURCE
+    
+    historical_data = _get_historical_data()
+    
+    # Cheap guard: load_json() replaces the object exactly when the file changes
+    if historical_data is not _SEGMENT_ANSWERS_SOURCE:
+        _success_rate.cache_clear()
+        _best_action.cache_clear()
+        _SEGMENT_ANSWERS_SOURCE = historical_data
+
+
+@lru_cache(maxsize=1024)
+def _success_rate(segment: str, action_type_lower: str) -> float:
+    """Memoized body of get_action_success_rate() (cleared when the data changes)."""
+    segment_data = _get_segment_data(segment)
+    
+    if segment_data is None:
+        return 0.5  # Default if no data
+    
+    successful_actions = segment_data.get('successful_actions', [])
+    
+    for action in successful_actions:
+        if action_type_lower in action.get('action', '').lower():
+            return action.get('success_rate', 0.5)
+    
+    return 0.5  # Default
+
+
+@lru_cache(maxsize=1024)
+def _best_action(segment: str) -> Dict:
+    """Memoized body of get_best_performing_action() (cleared when the data changes)."""
+    segment_data = _get_segment_data(segment)
     
-    if "error" in segment_data:
+    if segment_data is None:
         return {"error": "Segment not found"}
     
-    actions = segment_data.get('data', {}).get('successful_actions', [])
+    actions = segment_data.get('successful_actions', [])
     
     if not actions:
         return {"error": "No historical actions found"}
@@ -3,10 +3,21 @@ Inventory Tool - Checks product availability and margins
 Day 2 Concept: Tools & MCP
 """
 
-import json
 import os
 from typing import Dict, List, Optional
 
+import numpy as np
+
+from tools._jsoncache import load_json
+
+CATALOG_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'product_catalog.json')
+
+# product_id -> product and category -> products, rebuilt whenever the
+# cached catalog is re-read
+_PRODUCTS_BY_ID: Dict[str, Dict] = {}
+_PRODUCTS_BY_CATEGORY: Dict[str, List[Dict]] = {}
+_PRODUCTS_SOURCE: Optional[List[Dict]] = None
+
 
 def get_product_info(product_id: str) -> Dict:
     """
@@ -18,15 +29,10 @@ def get_product_info(product_id: str) -> Dict:
     Returns:
         Dictionary containing product information
     """
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'product_catalog.json')
-    
     try:
-        with open(data_path, 'r') as f:
-            products = json.load(f)
-        
-        for product in products:
-            if product['product_id'] == product_id:
-                return product
+        product = _get_products_index().get(product_id)
+        if product is not None:
+            return product
         
         return {"error": f"Product {product_id} not found"}
     
@@ -34,6 +40,33 @@ def get_product_info(product_id: str) -> Dict:
         return {"error": "Product catalog not found"}
 
 
+def _get_products_index() -> Dict[str, Dict]:
+    """
+    Return the product_id -> product index of the catalog.
+    
+    load_json() hands back the same parsed list until the file's mtime
+    changes, so the index is rebuilt only when that list is replaced.
+    
+    Raises:
+        FileNotFoundError: If the catalog is missing
+    """
+    _refresh_catalog_indexes()
+    return _PRODUCTS_BY_ID
+
+
+def _refresh_catalog_indexes() -> None:
+    """Rebuild the catalog indexes if the parsed catalog changed."""
+    global _PRODUCTS_BY_ID, _PRODUCTS_BY_CATEGORY, _PRODUCTS_SOURCE
+    
+    products = load_json(CATALOG_PATH)
+    if products is not _PRODUCTS_SOURCE:
+        by_id, by_category = {}, {}
+        for product in products:
+            by_id.setdefault(product.get('product_id'), product)  # First match wins, as before
+            by_category.setdefault(product.get('category'), []).append(product)
+        _PRODUCTS_BY_ID, _PRODUCTS_BY_CATEGORY, _PRODUCTS_SOURCE = by_id, by_category, products
+
+
 def check_stock_availability(product_id: str, quantity: int = 1) -> bool:
     """
     Check if sufficient stock is available.
@@ -63,13 +96,9 @@ def get_products_by_category(category: str) -> List[Dict]:
     Returns:
         List of matching products
     """
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'product_catalog.json')
-    
     try:
-        with open(data_path, 'r') as f:
-            products = json.load(f)
-        
-        return [p for p in products if p.get('category') == category]
+        _refresh_catalog_indexes()
+        return list(_PRODUCTS_BY_CATEGORY.get(category, ()))
     
     except FileNotFoundError:
         return []
@@ -91,10 +120,39 @@ def calculate_margin(product_id: str, discount_percent: float = 0) -> float:
     if "error" in product:
         return 0.0
     
-    price = product.get('price', 0)
-    cost = product.get('cost', 0)
-    
+    return round(_margin(product.get('price', 0), product.get('cost', 0), discount_percent), 2)
+
+
+def _margin(price: float, cost: float, discount_percent: float) -> float:
+    """Margin percentage of one price/cost pair after discount (0 if nothing is left of the price)."""
     discounted_price = price * (1 - discount_percent / 100)
-    margin = ((discounted_price - cost) / discounted_price * 100) if discounted_price > 0 else 0
+    return ((discounted_price - cost) / discounted_price * 100) if discounted_price > 0 else 0
+
+
+def calculate_margins_batch(product_ids: List[str], discount_percent: float = 0) -> np.ndarray:
+    """
+    Calculate profit margins after discount for many products at once.
+    
+    Args:
+        product_ids: Products to analyze
+        discount_percent: Discount percentage applied to every product
+        
+    Returns:
+        float64 array of margin percentages aligned with product_ids
+        (0.0 for unknown products, as calculate_margin())
+    """
+    try:
+        index = _get_products_index()
+    except FileNotFoundError:
+        return np.zeros(len(product_ids))
+    
+    products = [index.get(product_id, {}) for product_id in product_ids]
+    prices = np.array([p.get('price', 0) for p in products], dtype=np.float64)
+    costs = np.array([p.get('cost', 0) for p in products], dtype=np.float64)
     
-    return round(margin, 2)
+    discounted = prices * (1 - discount_percent / 100)
+    margins = np.divide(
+        discounted - costs, discounted,
+        out=np.zeros_like(discounted), where=discounted > 0
+    ) * 100
+    return np.round(margins, 2)
@@ -0,0 +1,78 @@
+"""
+Pipeline Cache - Reuses agent outputs for identical agent inputs
+Used by the Discovery agent (Agents 1-3) via agents.common.cache_outputs()
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Seconds a cached output stays valid; history-backed tools can change the
+# answer over time, so entries expire. 0 disables the cache.
+TTL_SECONDS = float(os.environ.get("PIPELINE_CACHE_TTL", "3600"))
+
+# Least recently used entries are evicted past this many
+MAX_ENTRIES = 1024
+
+_entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+def make_key(agent_name: str, canonical_inputs: str) -> str:
+    """
+    Build the cache key for one agent run.
+
+    Args:
+        agent_name: Agent whose output is cached
+        canonical_inputs: The agent's inputs serialized deterministically
+
+    Returns:
+        Hex digest identifying the (agent, inputs) pair
+    """
+    return hashlib.sha256(f"{agent_name}\n{canonical_inputs}".encode()).hexdigest()
+
+
+def get(key: str) -> Optional[Dict]:
+    """
+    Look up the outputs cached under a key.
+
+    Args:
+        key: Key from make_key()
+
+    Returns:
+        State key -> value dict, or None on a miss or expired entry
+    """
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+
+    stored_at, outputs = entry
+    if time.monotonic() - stored_at > TTL_SECONDS:
+        del _entries[key]
+        return None
+
+    _entries.move_to_end(key)
+    return outputs
+
+
+def set(key: str, outputs: Dict) -> None:
+    """
+    Store an agent's outputs under a key.
+
+    Args:
+        key: Key from make_key()
+        outputs: State key -> value dict written by the agent
+    """
+    if TTL_SECONDS <= 0:
+        return
+
+    _entries[key] = (time.monotonic(), outputs)
+    _entries.move_to_end(key)
+    while len(_entries) > MAX_ENTRIES:
+        _entries.popitem(last=False)
+
+
+def clear() -> None:
+    """Drop every cached output."""
+    _entries.clear()
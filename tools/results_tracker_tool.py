@@ -3,13 +3,130 @@ Results Tracker Tool - Records marketing action outcomes
 Used by Agent 9 (Results Tracker)
 """
 
+import asyncio
+import atexit
 import json
 import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
+from tools._jsoncache import dumps, load_json, loads
 
-def record_result(
+try:
+    import aiofiles
+    _AIOFILES_AVAILABLE = True
+except ImportError:
+    _AIOFILES_AVAILABLE = False
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+# Compacted history (rewritten only during compaction)
+ACTIONS_PATH = os.path.join(DATA_DIR, 'historical_actions.json')
+# Append-only log of actions recorded since the last compaction
+ACTIONS_LOG_PATH = os.path.join(DATA_DIR, 'historical_actions.jsonl')
+# Small aggregate keyed by "{segment}_{scenario}": {"count", "sum_roi"}
+PATTERNS_PATH = os.path.join(DATA_DIR, 'historical_patterns.json')
+
+# Fold the log into the compacted history once it grows past this size
+COMPACT_THRESHOLD_BYTES = 1_000_000
+
+# Recorded actions are buffered and appended to the log in one write once
+# this many are pending or this many seconds passed since the last write
+FLUSH_EVERY = 64
+FLUSH_INTERVAL_SECONDS = 5.0
+
+# ADK gathers the function calls of one model turn on the event loop, so
+# read-modify-write of a data file is serialized per file path.
+_LOCKS: Dict[str, asyncio.Lock] = {}
+
+# Action records not yet written to ACTIONS_LOG_PATH
+_pending: deque = deque()
+_recorded_count = 0  # Records ever buffered by this process
+# _pending_lock guards the deque itself and is only held for in-memory work,
+# so the event loop never waits on file I/O for it. _flush_lock orders the
+# log writers (flush, compaction) against readers of log + buffer.
+_pending_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+# Local-time ISO prefix ("YYYY-MM-DDTHH:MM:SS") of the second last stamped
+_stamp_second = None
+_stamp_prefix = ""
+
+
+def _timestamp() -> str:
+    """
+    Same text as datetime.now().isoformat(), formatting the date and time
+    fields only once per second.
+    """
+    global _stamp_second, _stamp_prefix
+    
+    second, nanos = divmod(time.time_ns(), 1_000_000_000)
+    if second != _stamp_second:
+        _stamp_second, _stamp_prefix = second, datetime.fromtimestamp(second).isoformat()
+    micros = nanos // 1000
+    return f"{_stamp_prefix}.{micros:06d}" if micros else _stamp_prefix
+
+
+def _lock_for(path: str) -> asyncio.Lock:
+    """Return the lock guarding writes to a data file."""
+    return _LOCKS.setdefault(os.path.abspath(path), asyncio.Lock())
+
+
+def _write_file(path: str, text: str, mode: str) -> None:
+    with open(path, mode, encoding='utf-8') as f:
+        f.write(text)
+
+
+def _replace_file(path: str, text: str) -> None:
+    """
+    Replace a file's contents atomically: write a temp file in the same
+    directory, fsync it, then os.replace() it over the original. A crash
+    leaves either the old or the new file, never a truncated one.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)  # mkstemp creates the file 0600
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+async def _write_text(path: str, text: str, mode: str = 'w') -> None:
+    """Write text without blocking the event loop (aiofiles, else a worker thread)."""
+    if _AIOFILES_AVAILABLE:
+        async with aiofiles.open(path, mode, encoding='utf-8') as f:
+            await f.write(text)
+    else:
+        await asyncio.to_thread(_write_file, path, text, mode)
+
+
+async def _load_patterns_async() -> Dict:
+    """Async variant of _load_patterns()."""
+    if not _AIOFILES_AVAILABLE:
+        return await asyncio.to_thread(_load_patterns)
+    try:
+        async with aiofiles.open(PATTERNS_PATH, 'r', encoding='utf-8') as f:
+            return loads(await f.read())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+async def record_result(
     customer_id: str,
     action_type: str,
     action_status: str,
@@ -35,9 +152,11 @@ def record_result(
     Returns:
         Confirmation dictionary
     """
+    global _recorded_count
+    
     # Prepare action record
     action_record = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _timestamp(),
         "customer_id": customer_id,
         "customer_segment": segment,
         "scenario_type": scenario,
@@ -49,29 +168,34 @@ def record_result(
         "approved_by": "human" if action_status == "scheduled" else "rejected",
     }
     
-    # File paths
-    actions_file = os.path.join(os.path.dirname(__file__), '..', 'data', 'historical_actions.json')
+    pattern_key = f"{segment}_{scenario}"
     
     try:
-        # Load existing data
-        if os.path.exists(actions_file):
-            with open(actions_file, 'r') as f:
-                all_actions = json.load(f)
-        else:
-            all_actions = []
+        # Buffered; appended to the log in batches instead of rewriting the whole history
+        with _pending_lock:
+            _pending.append(action_record)
+            _recorded_count += 1
         
-        # Append new action
-        all_actions.append(action_record)
+        # Only the small aggregate dict is rewritten
+        async with _lock_for(PATTERNS_PATH):
+            patterns = await _load_patterns_async()
+            pattern = patterns.setdefault(pattern_key, {"count": 0, "sum_roi": 0.0})
+            pattern["count"] += 1
+            pattern["sum_roi"] += float(predicted_roi or 0)
+            await _write_text(PATTERNS_PATH, dumps(patterns, indent=True))
         
-        # Save back
-        with open(actions_file, 'w') as f:
-            json.dump(all_actions, f, indent=2)
+        if len(_pending) >= FLUSH_EVERY or time.monotonic() - _last_flush >= FLUSH_INTERVAL_SECONDS:
+            async with _lock_for(ACTIONS_LOG_PATH):
+                await asyncio.to_thread(flush_results)
+            if os.path.getsize(ACTIONS_LOG_PATH) > COMPACT_THRESHOLD_BYTES:
+                await compact_history()
         
         return {
             "status": "success",
             "message": f"Action recorded as {action_status.upper()}",
             "recorded_data": action_record,
-            "total_historical_actions": len(all_actions),
+            "pattern_actions": pattern["count"],
+            "pattern_avg_predicted_roi": round(pattern["sum_roi"] / pattern["count"], 2),
             "learning_impact": f"This data will improve future predictions for {segment} customers in {scenario} scenarios"
         }
     
@@ -80,3 +204,117 @@ def record_result(
             "status": "error",
             "message": f"Failed to record action: {str(e)}"
         }
+
+
+def flush_results() -> int:
+    """
+    Append every buffered action record to the log and fsync it.
+    
+    Called by record_result() in batches and at interpreter exit; call it
+    directly wherever the log must be complete on disk.
+    
+    Returns:
+        Number of records written
+    """
+    global _last_flush
+    
+    with _flush_lock:
+        with _pending_lock:
+            records = list(_pending)
+            _pending.clear()
+        if records:
+            with open(ACTIONS_LOG_PATH, 'a', encoding='utf-8') as f:
+                f.write("".join(dumps(record) + "\n" for record in records))
+                f.flush()
+                os.fsync(f.fileno())
+        _last_flush = time.monotonic()
+    return len(records)
+
+
+atexit.register(flush_results)
+
+
+def buffered_version() -> Optional[Tuple[int, int]]:
+    """
+    Identify the records this process has buffered but not yet written.
+    
+    File mtimes don't change until flush_results() runs, so caches derived
+    from load_historical_actions() include this in their key.
+    
+    Returns:
+        (pid, records buffered so far), or None if nothing is pending
+    """
+    return (os.getpid(), _recorded_count) if _pending else None
+
+
+def _load_patterns() -> Dict:
+    """Load the per segment/scenario aggregate ({} if missing or unreadable)."""
+    try:
+        with open(PATTERNS_PATH, 'r', encoding='utf-8') as f:
+            return loads(f.read())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def load_historical_actions() -> List[Dict]:
+    """
+    Load every recorded action: the compacted history, the log, then any
+    records still buffered in memory.
+    
+    Returns:
+        List of action records, oldest first
+    """
+    # A flush moves records from the buffer to the log; holding _flush_lock
+    # keeps that from happening between the two reads
+    with _flush_lock:
+        actions = _load_persisted_actions()
+        with _pending_lock:
+            actions.extend(_pending)
+    return actions
+
+
+def _load_persisted_actions() -> List[Dict]:
+    """Load the compacted history followed by the log (no buffered records)."""
+    try:
+        # Cached until compaction rewrites the file; copied so the log can be appended
+        actions = list(load_json(ACTIONS_PATH))
+    except FileNotFoundError:
+        actions = []
+    
+    try:
+        with open(ACTIONS_LOG_PATH, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    actions.append(loads(line))
+    except FileNotFoundError:
+        pass
+    
+    return actions
+
+
+async def compact_history() -> int:
+    """
+    Fold the append-only log into historical_actions.json and truncate it.
+    
+    Returns:
+        Total number of actions in the compacted history
+    """
+    async with _lock_for(ACTIONS_LOG_PATH):
+        await asyncio.to_thread(flush_results)
+        return await asyncio.to_thread(_compact_persisted)
+
+
+def _compact_persisted() -> int:
+    """
+    Rewrite history + log as the compacted history and truncate the log.
+    
+    Records still buffered stay buffered and reach the log on the next
+    flush; _flush_lock keeps a flush from landing between read and truncate.
+    The history is swapped in atomically before the log is truncated, so a
+    crash part-way through can at worst leave records in both files.
+    """
+    with _flush_lock:
+        actions = _load_persisted_actions()
+        _replace_file(ACTIONS_PATH, dumps(actions, indent=True))
+        _write_file(ACTIONS_LOG_PATH, '', 'w')
+    return len(actions)
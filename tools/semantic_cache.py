@@ -0,0 +1,89 @@
+"""
+Semantic Cache Tool - Reuses generated profiles for equivalent prompts
+Used by Agent 0 (Proxy Customer Generator)
+"""
+
+import random
+from typing import Dict, List, Optional
+
+# Prompts with cosine similarity above this are treated as the same request
+SIMILARITY_THRESHOLD = 0.95
+
+# Number of distinct profiles kept per semantic key. Hits are only served once
+# the pool is full, so callers still see varied synthetic customers.
+POOL_SIZE = 20
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+_model = None
+_index = None
+_pools: List[List[Dict]] = []
+
+
+def _embed(prompt: str):
+    """Embed a prompt as a normalized float32 row vector (cosine == inner product)."""
+    global _model
+    if _model is None:
+        from sentence_transformers import SentenceTransformer
+        _model = SentenceTransformer(EMBEDDING_MODEL)
+    return _model.encode([prompt], normalize_embeddings=True).astype("float32")
+
+
+def _nearest(vector) -> Optional[int]:
+    """Return the pool index of the closest cached prompt above the threshold."""
+    if _index is None or _index.ntotal == 0:
+        return None
+    scores, ids = _index.search(vector, 1)
+    if scores[0][0] >= SIMILARITY_THRESHOLD:
+        return int(ids[0][0])
+    return None
+
+
+def get(prompt: str) -> Optional[Dict]:
+    """
+    Look up a cached profile for a semantically equivalent prompt.
+
+    Args:
+        prompt: Scenario prompt sent to the proxy agent
+
+    Returns:
+        A profile sampled uniformly from the matching pool, or None on a miss
+        (including while the pool is still being filled)
+    """
+    pool_id = _nearest(_embed(prompt))
+    if pool_id is None:
+        return None
+
+    pool = _pools[pool_id]
+    if len(pool) < POOL_SIZE:
+        return None
+
+    return random.choice(pool)
+
+
+def set(prompt: str, profile: Dict) -> None:
+    """
+    Store a generated profile under the prompt's semantic key.
+
+    Args:
+        prompt: Scenario prompt sent to the proxy agent
+        profile: Parsed customer profile returned by the model
+    """
+    global _index
+    vector = _embed(prompt)
+    pool_id = _nearest(vector)
+
+    if pool_id is None:
+        if _index is None:
+            import faiss
+            _index = faiss.IndexFlatIP(vector.shape[1])
+        _index.add(vector)
+        _pools.append([profile])
+        return
+
+    pool = _pools[pool_id]
+    if len(pool) < POOL_SIZE:
+        pool.append(profile)
+    else:
+        # Keep the pool fresh by replacing a random entry
+        pool[random.randrange(POOL_SIZE)] = profile
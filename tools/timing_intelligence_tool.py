@@ -3,10 +3,29 @@ Timing Intelligence Tool - Provides optimal timing recommendations
 Used by Agent 6 (Timing Optimizer)
 """
 
-import json
 import os
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from tools._jsoncache import load_json
+
+# Map touch number to timing key
+TOUCH_TIMING_KEYS = {
+    1: "optimal_followup_timing",
+    2: "second_touch_timing",
+    3: "final_touch_timing"
+}
+
+# (channel, is_weekend) -> (slot_name, slot_data) with the highest conversion
+# rate, rebuilt whenever the cached timing data is re-read
+_BEST_SLOTS: Dict[Tuple[str, bool], Tuple[str, Dict]] = {}
+_BEST_SLOTS_SOURCE: Optional[Dict] = None
+
+# channel -> {"best_days", "worst_days", "all_days"}, rebuilt whenever the
+# cached timing data is re-read
+_DOW_RANKINGS: Dict[str, Dict] = {}
+_DOW_RANKINGS_SOURCE: Optional[Dict] = None
 
 
 def query_timing_intelligence(data_type: str = "all") -> Dict:
@@ -23,8 +42,7 @@ def query_timing_intelligence(data_type: str = "all") -> Dict:
     data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'timing_intelligence.json')
     
     try:
-        with open(data_path, 'r') as f:
-            timing_data = json.load(f)
+        timing_data = load_json(data_path)
         
         if data_type == "all":
             return timing_data
@@ -43,7 +61,40 @@ def query_timing_intelligence(data_type: str = "all") -> Dict:
         return {"error": "Timing intelligence file not found"}
 
 
-def get_optimal_send_time(channel: str, urgency: str = "medium", customer_scenario: str = None) -> Dict:
+def _get_best_slots(timing_data: Dict) -> Dict[Tuple[str, bool], Tuple[str, Dict]]:
+    """
+    Return the best send slot per channel and weekday/weekend.
+    
+    Args:
+        timing_data: Full timing data from query_timing_intelligence()
+        
+    Returns:
+        (channel, is_weekend) -> (slot_name, slot_data)
+    """
+    global _BEST_SLOTS, _BEST_SLOTS_SOURCE
+    
+    if timing_data is not _BEST_SLOTS_SOURCE:
+        best_slots = {}
+        for channel, channel_timing in timing_data.get('channel_timing', {}).items():
+            for is_weekend, key in ((False, 'best_send_times_weekday'), (True, 'best_send_times_weekend')):
+                best_times = channel_timing.get(key, {})
+                if best_times:
+                    # Select the slot with highest conversion rate
+                    best_slots[(channel, is_weekend)] = max(
+                        best_times.items(), key=lambda x: x[1].get('conversion_rate', 0)
+                    )
+        _BEST_SLOTS, _BEST_SLOTS_SOURCE = best_slots, timing_data
+        return best_slots
+    
+    return _BEST_SLOTS
+
+
+def get_optimal_send_time(
+    channel: str,
+    urgency: str = "medium",
+    customer_scenario: str = None,
+    now: Optional[datetime] = None
+) -> Dict:
     """
     Get optimal send time for a channel and scenario.
     
@@ -51,6 +102,8 @@ def get_optimal_send_time(channel: str, urgency: str = "medium", customer_scenar
         channel: Communication channel ('email', 'sms', 'push', etc.)
         urgency: Urgency level ('low', 'medium', 'high', 'very_high')
         customer_scenario: Customer scenario type
+        now: Planning time deciding weekday vs weekend (default: now); batch
+             callers pass one value for every customer
         
     Returns:
         Optimal timing recommendation
@@ -85,19 +138,14 @@ def get_optimal_send_time(channel: str, urgency: str = "medium", customer_scenar
         }
     
     # Get current day of week
-    now = datetime.now()
+    if now is None:
+        now = datetime.now()
     is_weekend = now.weekday() >= 5  # Saturday = 5, Sunday = 6
     
-    # Select timing based on weekday/weekend
-    if is_weekend:
-        best_times = channel_timing.get('best_send_times_weekend', {})
-    else:
-        best_times = channel_timing.get('best_send_times_weekday', {})
+    # Best slot for weekday/weekend, precomputed once per load
+    best_slot = _get_best_slots(timing_data).get((channel.lower(), is_weekend))
     
-    # Find best time slot
-    if best_times:
-        # Select the slot with highest conversion rate
-        best_slot = max(best_times.items(), key=lambda x: x[1].get('conversion_rate', 0))
+    if best_slot:
         slot_name, slot_data = best_slot
         
         return {
@@ -133,14 +181,7 @@ def get_followup_timing(customer_scenario: str, touch_number: int = 1) -> Dict:
     if not scenario_data:
         return {"error": f"Unknown scenario: {customer_scenario}"}
     
-    # Map touch number to timing key
-    timing_keys = {
-        1: "optimal_followup_timing",
-        2: "second_touch_timing",
-        3: "final_touch_timing"
-    }
-    
-    timing_key = timing_keys.get(touch_number, "optimal_followup_timing")
+    timing_key = TOUCH_TIMING_KEYS.get(touch_number, "optimal_followup_timing")
     timing = scenario_data.get(timing_key, "24_hours")
     
     return {
@@ -151,6 +192,44 @@ def get_followup_timing(customer_scenario: str, touch_number: int = 1) -> Dict:
     }
 
 
+def _get_dow_rankings(timing_data: Dict) -> Dict[str, Dict]:
+    """
+    Return the day-of-week rankings for every channel in the data.
+    
+    Args:
+        timing_data: Full timing data from query_timing_intelligence()
+        
+    Returns:
+        channel -> {"best_days", "worst_days", "all_days"}
+    """
+    global _DOW_RANKINGS, _DOW_RANKINGS_SOURCE
+    
+    if timing_data is not _DOW_RANKINGS_SOURCE:
+        by_channel: Dict[str, List[Dict]] = {}
+        for day, data in timing_data.get('day_of_week_insights', {}).items():
+            for key, performance in data.items():
+                if key.endswith('_performance'):
+                    by_channel.setdefault(key[:-len('_performance')], []).append({
+                        "day": day,
+                        "performance": performance,
+                        "message_tone": data.get('best_message_tone')
+                    })
+        
+        rankings = {}
+        for channel, day_rankings in by_channel.items():
+            # Sort by performance
+            day_rankings.sort(key=lambda x: x['performance'], reverse=True)
+            rankings[channel] = {
+                "best_days": day_rankings[:3],
+                "worst_days": day_rankings[-2:],
+                "all_days": day_rankings
+            }
+        _DOW_RANKINGS, _DOW_RANKINGS_SOURCE = rankings, timing_data
+        return rankings
+    
+    return _DOW_RANKINGS
+
+
 def get_day_of_week_insights(channel: str = "email") -> Dict:
     """
     Get performance insights by day of week.
@@ -167,27 +246,36 @@ def get_day_of_week_insights(channel: str = "email") -> Dict:
     if not dow_insights:
         return {"error": "No day of week insights available"}
     
-    # Rank days by performance for the channel
-    performance_key = f"{channel}_performance"
-    
-    day_rankings = []
-    for day, data in dow_insights.items():
-        if performance_key in data:
-            day_rankings.append({
-                "day": day,
-                "performance": data[performance_key],
-                "message_tone": data.get('best_message_tone')
-            })
+    # Rankings are precomputed once per load
+    rankings = _get_dow_rankings(timing_data).get(channel)
+    if rankings is None:
+        return {"channel": channel, "best_days": [], "worst_days": [], "all_days": []}
     
-    # Sort by performance
-    day_rankings.sort(key=lambda x: x['performance'], reverse=True)
-    
-    return {
-        "channel": channel,
-        "best_days": day_rankings[:3],
-        "worst_days": day_rankings[-2:],
-        "all_days": day_rankings
-    }
+    return {"channel": channel, **rankings}
+
+
+@lru_cache(maxsize=256)
+def _parse_iso(value: str) -> datetime:
+    """datetime.fromisoformat(), memoized for the planning times batches repeat."""
+    return datetime.fromisoformat(value)
+
+
+@lru_cache(maxsize=64)
+def _slot_start_minutes(time_range: str) -> Optional[int]:
+    """
+    Start of a "HH:MM - HH:MM" slot as minutes after midnight, parsed once per
+    distinct range (None if it isn't a valid time range).
+    """
+    if '-' not in time_range:
+        return None
+    try:
+        # Parse start time (e.g., "19:00")
+        hour, minute = map(int, time_range.split('-')[0].strip().split(':'))
+    except ValueError:
+        return None
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        return None
+    return hour * 60 + minute
 
 
 def calculate_send_time(
@@ -208,16 +296,19 @@ def calculate_send_time(
     Returns:
         Calculated send datetime as ISO string
     """
+    # Read the clock once; it is also the weekday/weekend planning time
+    now = datetime.now()
+    
     # Parse from_time string to datetime
     if from_time is None:
-        from_time_dt = datetime.now()
+        from_time_dt = now
     else:
         try:
-            from_time_dt = datetime.fromisoformat(from_time)
+            from_time_dt = _parse_iso(from_time)
         except (ValueError, TypeError):
-            from_time_dt = datetime.now()
+            from_time_dt = now
     
-    timing_rec = get_optimal_send_time(channel, urgency, customer_scenario)
+    timing_rec = get_optimal_send_time(channel, urgency, customer_scenario, now=now)
     
     # Handle immediate
     if timing_rec.get('recommended_timing') == 'immediate':
@@ -228,25 +319,27 @@ def calculate_send_time(
         result = from_time_dt + timedelta(minutes=30)
         return result.isoformat()
     
-    # Parse time range
-    time_range = timing_rec.get('time_range', '')
-    if '-' in time_range:
-        start_time_str = time_range.split('-')[0].strip()
-        try:
-            # Parse start time (e.g., "19:00")
-            hour, minute = map(int, start_time_str.split(':'))
-            
-            # Create datetime for today at that time
-            send_time = from_time_dt.replace(hour=hour, minute=minute, second=0, microsecond=0)
-            
-            # If time has passed today, schedule for tomorrow
-            if send_time < from_time_dt:
-                send_time += timedelta(days=1)
-            
-            return send_time.isoformat()
-        except:
-            pass
+    # Slot start, parsed once per distinct time range
+    start_minutes = _slot_start_minutes(timing_rec.get('time_range', ''))
+    if start_minutes is not None:
+        hour, minute = divmod(start_minutes, 60)
+        
+        # Create datetime for today at that time
+        send_time = from_time_dt.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        
+        # If time has passed today, schedule for tomorrow
+        if send_time < from_time_dt:
+            send_time += timedelta(days=1)
+        
+        return send_time.isoformat()
     
     # Default: schedule for next business hours
     result = from_time_dt + timedelta(hours=2)
     return result.isoformat()
+
+
+def warm() -> None:
+    """Parse the timing data and build the best-slot table ahead of the first tool call."""
+    timing_data = query_timing_intelligence()
+    if "error" not in timing_data:
+        _get_best_slots(timing_data)